@@ -1,9 +1,30 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routers import solve, health
+from .config import settings
+from .routers import field, jobs, solve, health, metrics as metrics_router
+from .services import metrics
+from .services.jobs import store as job_store
+from .services.worker_pool import pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arranca el pool sin importar SymPy y lo precalienta en segundo plano."""
+    pool.start()
+    warmup = asyncio.create_task(pool.warmup()) if settings.SOLVER_WARMUP else None
+    yield
+    if warmup is not None:
+        warmup.cancel()
+    job_store.shutdown()
+    pool.shutdown()
+
 
-app = FastAPI(title="DiffEQ Solver API", version="2.0.0")
+app = FastAPI(title="DiffEQ Solver API", version="2.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,5 +34,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Recolecta los tiempos por etapa de la petición y los expone en Server-Timing."""
+    timings = metrics.begin_request()
+    start = time.perf_counter()
+    response = await call_next(request)
+    if settings.SERVER_TIMING:
+        timings.append(("total", time.perf_counter() - start))
+        response.headers["Server-Timing"] = metrics.server_timing_header(timings)
+    return response
+
+
 app.include_router(health.router)
 app.include_router(solve.router)
+app.include_router(field.router)
+app.include_router(jobs.router)
+app.include_router(metrics_router.router)
@@ -0,0 +1 @@
+# Suite de benchmarks y arnés de regresión para los solvers
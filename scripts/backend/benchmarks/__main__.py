@@ -0,0 +1,60 @@
+"""
+Uso (desde scripts/):
+    python -m backend.benchmarks --output bench.json
+    python -m backend.benchmarks --baseline bench.json --threshold 0.25
+Termina con código 1 si hay regresiones respecto a la línea base.
+"""
+
+import argparse
+import json
+import sys
+
+from .corpus import select
+from .runner import compare, run_suite
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks de los solvers de EDO")
+    ap.add_argument("--repeat", type=int, default=3, help="Repeticiones por caso")
+    ap.add_argument("--warmup", type=int, default=1, help="Corridas descartadas antes de medir")
+    ap.add_argument("--steps", type=int, default=1000, help="Pasos de la etapa de integración")
+    ap.add_argument("--cases", default="", help="Nombres de casos separados por coma")
+    ap.add_argument("--types", default="", help="Tipos de ecuación separados por coma")
+    ap.add_argument("--output", help="Archivo donde guardar los resultados JSON")
+    ap.add_argument("--baseline", help="Resultados JSON previos para comparar")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Regresión relativa tolerada (0.25 = 25%%)")
+    ap.add_argument("--min-delta", type=float, default=0.002, help="Diferencia mínima en segundos para contar")
+    args = ap.parse_args(argv)
+
+    cases = select(
+        [c for c in args.cases.split(",") if c] or None,
+        [t for t in args.types.split(",") if t] or None,
+    )
+    if not cases:
+        print("No hay casos que coincidan con el filtro.", file=sys.stderr)
+        return 2
+
+    results = run_suite(cases, repeat=args.repeat, n_steps=args.steps, warmup=args.warmup)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for reg in regressions:
+            print(
+                f"REGRESIÓN {reg['case']}/{reg['stage']}: "
+                f"{reg['baseline'] * 1000:.2f} ms -> {reg['current'] * 1000:.2f} ms (x{reg['ratio']:.2f})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
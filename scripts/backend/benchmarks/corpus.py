@@ -0,0 +1,56 @@
+"""Corpus curado de ecuaciones por tipo, usado por la suite de benchmarks."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass
+class BenchCase:
+    name: str
+    equation_type: str
+    equations: List[str]
+    # Estado inicial para la etapa de integración: y, y', ... (None = no aplica)
+    x0: float = 0.0
+    initial: Optional[List[float]] = None
+    variables: List[str] = field(default_factory=list)
+
+    @property
+    def is_system(self) -> bool:
+        return len(self.equations) > 1
+
+
+CORPUS: List[BenchCase] = [
+    BenchCase("separable_xy", "separable", ["dy/dx = x*y"], initial=[1.0]),
+    BenchCase("separable_trig", "separable", ["dy/dx = cos(x)/(y+2)"], initial=[1.0]),
+    BenchCase("homogeneous_ratio", "homogeneous", ["dy/dx = (x+y)/x"], x0=1.0, initial=[1.0]),
+    BenchCase("exact_poly", "exact", ["(2*x*y)dx + (x^2+1)dy = 0"], initial=[1.0]),
+    BenchCase("linear_first", "linear", ["dy/dx + y = x"], initial=[1.0]),
+    BenchCase("linear_exp", "linear", ["dy/dx + 2*y = exp(-x)"], initial=[0.0]),
+    BenchCase("bernoulli_quad", "bernoulli", ["dy/dx + y = x*y^2"], initial=[0.5]),
+    BenchCase("second_order_damped", "second_order_const", ["y'' + 3*y' + 2*y = 0"], initial=[1.0, 0.0]),
+    BenchCase("second_order_forced", "second_order_const", ["y'' + y = sin(2*x)"], initial=[0.0, 1.0]),
+    BenchCase("reducible_xy", "reducible", ["x*y'' + y' = 0"], x0=1.0, initial=[0.0, 1.0]),
+    BenchCase(
+        "system_oscillator",
+        "system",
+        ["Derivative(y1(x),x) = y2(x)", "Derivative(y2(x),x) = -y1(x)"],
+        initial=[1.0, 0.0],
+        variables=["y1", "y2"],
+    ),
+    BenchCase(
+        "system_coupled",
+        "system",
+        ["Derivative(y1(x),x) = y1(x) - y2(x)", "Derivative(y2(x),x) = 2*y1(x) - y2(x)"],
+        initial=[1.0, 1.0],
+        variables=["y1", "y2"],
+    ),
+]
+
+
+def select(names: Optional[List[str]] = None, types: Optional[List[str]] = None) -> List[BenchCase]:
+    cases = CORPUS
+    if names:
+        cases = [c for c in cases if c.name in names]
+    if types:
+        cases = [c for c in cases if c.equation_type in types]
+    return cases
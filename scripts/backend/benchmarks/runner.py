@@ -0,0 +1,142 @@
+"""
+Ejecución de la suite: mide por separado cada etapa del pipeline de resolución
+(parse, classify, dsolve, simplify, latex, lambdify, integrate) para cada caso
+del corpus y compara contra una línea base guardada.
+"""
+
+import platform
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import sympy as sp
+from sympy import Eq, Function, classify_ode, dsolve, latex, simplify, symbols
+from sympy.core.cache import clear_cache
+from sympy.solvers.ode.ode import classify_sysode
+
+from ..services import numeric_solver, parser
+from .corpus import BenchCase
+
+STAGES = ("parse", "classify", "dsolve", "simplify", "latex", "lambdify", "integrate")
+x = symbols("x")
+
+
+def _parse(case: BenchCase):
+    eqs = []
+    for expr in case.equations:
+        eq_str, _ = parser.normalize_equation(expr)
+        left, right = parser.parse_equation(eq_str, case.variables or None)
+        eqs.append(Eq(left, right) if right is not None else left)
+    return eqs
+
+
+def run_case_once(case: BenchCase, step: float = 0.01, n_steps: int = 1000) -> Dict[str, Optional[float]]:
+    """Ejecuta el pipeline completo una vez; devuelve segundos por etapa (None si no aplica)."""
+    clear_cache()
+    timings: Dict[str, Optional[float]] = dict.fromkeys(STAGES)
+    funcs = [Function(v) for v in case.variables] if case.is_system else [Function("y")]
+
+    t0 = time.perf_counter()
+    eqs = _parse(case)
+    timings["parse"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    if case.is_system:
+        classify_sysode(eqs, [f(x) for f in funcs])
+    else:
+        classify_ode(eqs[0], funcs[0](x))
+    timings["classify"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    solution = dsolve(eqs) if case.is_system else dsolve(eqs[0], funcs[0](x))
+    timings["dsolve"] = time.perf_counter() - t0
+    solutions = solution if isinstance(solution, (list, tuple)) else [solution]
+
+    t0 = time.perf_counter()
+    simplified = [simplify(sol.rhs) if isinstance(sol, Eq) else simplify(sol) for sol in solutions]
+    timings["simplify"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for sol in simplified:
+        latex(sol)
+    timings["latex"] = time.perf_counter() - t0
+
+    if case.initial is None:
+        return timings
+
+    t0 = time.perf_counter()
+    if case.is_system or len(case.initial) > 1:
+        # Sistemas y EDO de orden n: reducción a primer orden con estado vectorial
+        f = numeric_solver.reduce_to_first_order(eqs, funcs).f
+        y0 = np.array(case.initial, dtype=float)
+    else:
+        f = numeric_solver.build_rhs_scalar(eqs[0], funcs[0])
+        y0 = case.initial[0]
+    timings["lambdify"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    numeric_solver.integrate(numeric_solver.rk4_step, f, case.x0, y0, step, n_steps)
+    timings["integrate"] = time.perf_counter() - t0
+    return timings
+
+
+def run_suite(
+    cases: List[BenchCase], repeat: int = 3, step: float = 0.01, n_steps: int = 1000, warmup: int = 1
+) -> Dict:
+    """Corre cada caso `repeat` veces (tras `warmup` corridas descartadas) y resume min/mediana por etapa."""
+    results = {}
+    for case in cases:
+        for _ in range(warmup):
+            run_case_once(case, step, n_steps)
+        runs = [run_case_once(case, step, n_steps) for _ in range(repeat)]
+        summary = {}
+        for stage in STAGES:
+            values = [r[stage] for r in runs if r[stage] is not None]
+            if values:
+                summary[stage] = {"min": min(values), "median": statistics.median(values)}
+        summary["total"] = {
+            "min": min(sum(v for v in r.values() if v is not None) for r in runs),
+            "median": statistics.median(sum(v for v in r.values() if v is not None) for r in runs),
+        }
+        results[case.name] = {"equation_type": case.equation_type, "stages": summary}
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sympy": sp.__version__,
+            "numpy": np.__version__,
+            "repeat": repeat,
+            "warmup": warmup,
+            "integrate_steps": n_steps,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.25, min_delta: float = 0.002) -> List[Dict]:
+    """
+    Lista las regresiones: etapas cuya mediana supera a la línea base en más de
+    `threshold` (fracción) y en más de `min_delta` segundos (piso de ruido).
+    """
+    regressions = []
+    for name, data in current.get("results", {}).items():
+        base_case = baseline.get("results", {}).get(name)
+        if not base_case:
+            continue
+        for stage, stats in data["stages"].items():
+            base_stats = base_case["stages"].get(stage)
+            if not base_stats:
+                continue
+            cur, base = stats["median"], base_stats["median"]
+            if cur - base > min_delta and cur > base * (1 + threshold):
+                regressions.append(
+                    {
+                        "case": name,
+                        "stage": stage,
+                        "baseline": base,
+                        "current": cur,
+                        "ratio": cur / base if base else float("inf"),
+                    }
+                )
+    return regressions
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dataclasses import dataclass
 
 
@@ -13,6 +14,90 @@ class Settings:
     )
     QWEN_MODEL: str = os.getenv("QWEN_MODEL", "qwen-plus")
     QWEN_TIMEOUT: int = int(os.getenv("QWEN_TIMEOUT", "20"))
+    # Stub local de Qwen (pruebas de carga offline): no hace llamadas de red
+    QWEN_STUB: bool = os.getenv("QWEN_STUB", "0").lower() in ("1", "true", "yes")
+    QWEN_STUB_LATENCY: float = float(os.getenv("QWEN_STUB_LATENCY", "0.05"))
+
+    # Integración numérica: umbral de desborde y localización de eventos
+    NUMERIC_OVERFLOW_LIMIT: float = float(os.getenv("NUMERIC_OVERFLOW_LIMIT", "1e100"))
+    EVENT_TOLERANCE: float = float(os.getenv("EVENT_TOLERANCE", "1e-10"))
+    EVENT_MAX_ITER: int = int(os.getenv("EVENT_MAX_ITER", "60"))
+
+    # Instrumentación: header Server-Timing con tiempos por etapa
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+
+    # Pool de workers de resolución y precalentamiento al arrancar
+    SOLVER_WORKERS: int = int(os.getenv("SOLVER_WORKERS", "4"))
+    SOLVER_POOL_MODE: str = os.getenv("SOLVER_POOL_MODE", "thread")  # thread | process
+    SOLVER_WARMUP: bool = os.getenv("SOLVER_WARMUP", "1").lower() in ("1", "true", "yes")
+    # Carril pesado (baja prioridad) para ecuaciones complejas: no ocupa el pool normal
+    SOLVER_HEAVY_WORKERS: int = int(os.getenv("SOLVER_HEAVY_WORKERS", "1"))
+    # Planificación justa por cliente (API key o IP) delante del pool
+    SCHEDULER_MAX_INFLIGHT_PER_CLIENT: int = int(os.getenv("SCHEDULER_MAX_INFLIGHT_PER_CLIENT", "2"))
+    SCHEDULER_MAX_QUEUED_PER_CLIENT: int = int(os.getenv("SCHEDULER_MAX_QUEUED_PER_CLIENT", "50"))
+    # Trabajos asíncronos (/jobs): resultados guardados en memoria durante JOBS_TTL segundos
+    JOBS_TTL: float = float(os.getenv("JOBS_TTL", "3600"))
+    JOBS_MAX_STORED: int = int(os.getenv("JOBS_MAX_STORED", "1000"))
+    # Soluciones generales en caché por ecuación (PVI repetidos = solo constantes)
+    GENERAL_SOLUTION_CACHE_SIZE: int = int(os.getenv("GENERAL_SOLUTION_CACHE_SIZE", "512"))
+
+    # Memo de integrate/simplify compartido entre peticiones (SQLite opcional)
+    SYMBOLIC_MEMO_SIZE: int = int(os.getenv("SYMBOLIC_MEMO_SIZE", "2048"))
+    SYMBOLIC_MEMO_PATH: str | None = os.getenv("SYMBOLIC_MEMO_PATH") or None
+    SYMBOLIC_MEMO_PERSIST_SIZE: int = int(os.getenv("SYMBOLIC_MEMO_PERSIST_SIZE", "20000"))
+
+    # Complejidad de entrada: límites de rechazo y umbrales del carril pesado
+    COMPLEXITY_MAX_CHARS: int = int(os.getenv("COMPLEXITY_MAX_CHARS", "4000"))
+    COMPLEXITY_MAX_OPS: int = int(os.getenv("COMPLEXITY_MAX_OPS", "800"))
+    COMPLEXITY_MAX_DEPTH: int = int(os.getenv("COMPLEXITY_MAX_DEPTH", "60"))
+    COMPLEXITY_MAX_ORDER: int = int(os.getenv("COMPLEXITY_MAX_ORDER", "10"))
+    COMPLEXITY_HEAVY_OPS: int = int(os.getenv("COMPLEXITY_HEAVY_OPS", "60"))
+    COMPLEXITY_HEAVY_DEPTH: int = int(os.getenv("COMPLEXITY_HEAVY_DEPTH", "12"))
+    # Ecuaciones pesadas con CI y método simbólico se integran con RK4 en lugar de dsolve
+    COMPLEXITY_NUMERIC_FALLBACK: bool = os.getenv("COMPLEXITY_NUMERIC_FALLBACK", "1").lower() in ("1", "true", "yes")
+
+    # Muestreo de soluciones simbólicas (sample)
+    SAMPLE_MAX_GRID: int = int(os.getenv("SAMPLE_MAX_GRID", "400"))
+    SAMPLE_DECIMALS: int = int(os.getenv("SAMPLE_DECIMALS", "8"))
+
+    # Campos de direcciones guardados por (ecuación, ventana, resolución)
+    FIELD_CACHE_SIZE: int = int(os.getenv("FIELD_CACHE_SIZE", "256"))
+
+    # Plano de fase: caché de jacobianos/equilibrios y Newton de respaldo
+    PHASE_CACHE_SIZE: int = int(os.getenv("PHASE_CACHE_SIZE", "128"))
+    PHASE_NEWTON_SEEDS: int = int(os.getenv("PHASE_NEWTON_SEEDS", "12"))
+    PHASE_NEWTON_ITER: int = int(os.getenv("PHASE_NEWTON_ITER", "40"))
+
+    # Soluciones en serie: recurrencias por (ecuación, centro), extendidas bajo demanda
+    SERIES_CACHE_SIZE: int = int(os.getenv("SERIES_CACHE_SIZE", "128"))
+    SERIES_MAX_TERMS: int = int(os.getenv("SERIES_MAX_TERMS", "400"))
+
+    # Precisión múltiple (mpmath) para problemas mal condicionados
+    MP_DPS: int = int(os.getenv("MP_DPS", "30"))
+    MP_MAX_DPS: int = int(os.getenv("MP_MAX_DPS", "240"))
+    # Acuerdo relativo entre dos precisiones para aceptar el resultado
+    MP_TOLERANCE: float = float(os.getenv("MP_TOLERANCE", "1e-12"))
+    # Error de redondeo float64 estimado a partir del cual se escala (modo auto)
+    MP_CONSISTENCY_TOLERANCE: float = float(os.getenv("MP_CONSISTENCY_TOLERANCE", "1e-8"))
+    MP_PERTURBATION: float = float(os.getenv("MP_PERTURBATION", "1e-8"))
+    MP_CHECK_POINTS: int = int(os.getenv("MP_CHECK_POINTS", "8"))
+
+    # Verificación local de soluciones por residuo numérico
+    VERIFY_SAMPLES: int = int(os.getenv("VERIFY_SAMPLES", "16"))
+    VERIFY_MIN_POINTS: int = int(os.getenv("VERIFY_MIN_POINTS", "4"))
+    VERIFY_TOLERANCE: float = float(os.getenv("VERIFY_TOLERANCE", "1e-8"))
+    VERIFY_MP_DPS: int = int(os.getenv("VERIFY_MP_DPS", "50"))
+    VERIFY_SEED: int = int(os.getenv("VERIFY_SEED", "20240"))
+
+    # Coalescer resoluciones idénticas concurrentes en un único cálculo
+    SINGLE_FLIGHT: bool = os.getenv("SINGLE_FLIGHT", "1").lower() in ("1", "true", "yes")
+
+    # Perfilado por petición (profile=true); requiere X-Admin-Token == ADMIN_TOKEN
+    ADMIN_TOKEN: str | None = os.getenv("ADMIN_TOKEN")
+    PROFILE_MODE: str = os.getenv("PROFILE_MODE", "sampling")  # sampling | deterministic
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "diffeq-profiles"))
+    PROFILE_SAMPLE_INTERVAL: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.002"))
+    PROFILE_TOP: int = int(os.getenv("PROFILE_TOP", "25"))
 
 
 settings = Settings()
@@ -0,0 +1 @@
+# Generador de carga local para la API de FastAPI
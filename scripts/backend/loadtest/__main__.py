@@ -0,0 +1,110 @@
+"""
+Uso (desde scripts/):
+    python -m backend.loadtest --rps 5 --duration 30 --mix symbolic=5,numeric=3,system=2
+    python -m backend.loadtest --serve --rps 20 --duration 60      # levanta uvicorn local
+    python -m backend.loadtest --target http://127.0.0.1:8000      # servidor ya iniciado (usa QWEN_STUB=1)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from .runner import in_process_client, run_load
+from .workload import Workload, parse_mix
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2]
+
+
+def _spawn_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "QWEN_STUB": "1"}
+    cmd = [
+        sys.executable, "-m", "uvicorn", "backend.app:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ]
+    proc = subprocess.Popen(cmd, cwd=SCRIPTS_DIR, env=env)
+    url = f"http://127.0.0.1:{port}/health"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn no respondió en /health")
+
+
+def _print_report(report: dict):
+    print(f"Duración {report['duration_s']} s, objetivo {report['target_rps']} rps, enviadas {report['offered']}")
+    header = f"{'endpoint':<28}{'req':>6}{'err%':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+    print(header)
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<28}{row['requests']:>6}{row['error_rate'] * 100:>6.1f}%{row['throughput_rps']:>8.2f}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}"
+        )
+
+
+async def _main(args) -> dict:
+    workload = Workload(parse_mix(args.mix), steps=args.steps, qwen_ratio=args.qwen_ratio, seed=args.seed)
+    if args.target == "inprocess":
+        client = in_process_client(args.timeout)
+    else:
+        client = httpx.AsyncClient(base_url=args.target, timeout=args.timeout)
+    async with client:
+        return await run_load(
+            client,
+            workload,
+            rps=args.rps,
+            duration=args.duration,
+            max_concurrency=args.max_concurrency,
+            poisson=args.poisson,
+            seed=args.seed,
+        )
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Generador de carga offline para la API de EDO")
+    ap.add_argument("--target", default="inprocess", help="'inprocess' o URL base (http://127.0.0.1:8000)")
+    ap.add_argument("--serve", action="store_true", help="Levantar uvicorn local con QWEN_STUB=1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=1, help="Workers de uvicorn con --serve")
+    ap.add_argument("--rps", type=float, default=5.0)
+    ap.add_argument("--duration", type=float, default=30.0, help="Segundos de envío")
+    ap.add_argument("--mix", default="symbolic=5,numeric=3,system=2")
+    ap.add_argument("--steps", type=int, default=200, help="Pasos de las peticiones numéricas")
+    ap.add_argument("--qwen-ratio", type=float, default=0.0, help="Fracción de simbólicas con with_qwen")
+    ap.add_argument("--poisson", action="store_true", help="Llegadas Poisson en vez de uniformes")
+    ap.add_argument("--max-concurrency", type=int, default=256)
+    ap.add_argument("--timeout", type=float, default=120.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--output", help="Guardar el reporte JSON")
+    args = ap.parse_args(argv)
+
+    server = None
+    if args.serve:
+        server = _spawn_uvicorn(args.port, args.workers)
+        args.target = f"http://127.0.0.1:{args.port}"
+    try:
+        report = asyncio.run(_main(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if report["endpoints"].get("total", {}).get("errors") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
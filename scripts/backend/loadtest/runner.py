@@ -0,0 +1,111 @@
+"""
+Bucle abierto de carga: lanza peticiones a una tasa objetivo (RPS) durante un
+tiempo dado, ya sea contra la app en proceso (ASGI) o contra un servidor local,
+y resume throughput, latencias p50/p95/p99 y errores por endpoint.
+"""
+
+import asyncio
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from .workload import Workload
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    # Percentil por rango más cercano
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[Dict], duration: float) -> Dict:
+    groups: Dict[str, List[Dict]] = {}
+    for sample in samples:
+        groups.setdefault(f"{sample['endpoint']} [{sample['kind']}]", []).append(sample)
+    groups["total"] = samples
+    report = {}
+    for name, group in groups.items():
+        if not group:
+            continue
+        latencies = sorted(s["latency"] for s in group)
+        errors = sum(1 for s in group if not s["ok"])
+        report[name] = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group),
+            "throughput_rps": (len(group) - errors) / duration if duration else 0.0,
+            "p50_ms": _ms(percentile(latencies, 50)),
+            "p95_ms": _ms(percentile(latencies, 95)),
+            "p99_ms": _ms(percentile(latencies, 99)),
+            "max_ms": _ms(latencies[-1] if latencies else None),
+        }
+    return report
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 2) if value is not None else None
+
+
+async def _fire(client: httpx.AsyncClient, item, samples: List[Dict], sem: asyncio.Semaphore):
+    async with sem:
+        start = time.perf_counter()
+        try:
+            resp = await client.post(item.endpoint, json=item.payload)
+            ok = resp.status_code < 400
+            status = resp.status_code
+        except httpx.HTTPError as exc:
+            ok, status = False, type(exc).__name__
+        samples.append(
+            {
+                "kind": item.kind,
+                "endpoint": item.endpoint,
+                "latency": time.perf_counter() - start,
+                "ok": ok,
+                "status": status,
+            }
+        )
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    rps: float,
+    duration: float,
+    max_concurrency: int = 256,
+    poisson: bool = False,
+    seed: int = 0,
+) -> Dict:
+    rng = random.Random(seed)
+    samples: List[Dict] = []
+    sem = asyncio.Semaphore(max_concurrency)
+    tasks = []
+    start = time.perf_counter()
+    next_at = 0.0
+    while next_at < duration:
+        delay = start + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(_fire(client, workload.next(), samples, sem)))
+        next_at += rng.expovariate(rps) if poisson else 1.0 / rps
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return {
+        "target_rps": rps,
+        "duration_s": round(elapsed, 3),
+        "offered": len(tasks),
+        "endpoints": summarize(samples, elapsed),
+    }
+
+
+def in_process_client(timeout: float) -> httpx.AsyncClient:
+    """Cliente ASGI contra backend.app:app con Qwen reemplazado por el stub local."""
+    from ..app import app
+    from ..config import settings
+
+    settings.QWEN_STUB = True
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout)
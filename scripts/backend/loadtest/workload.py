@@ -0,0 +1,97 @@
+"""Plantillas de peticiones por tipo de carga (simbólica, numérica, sistemas)."""
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List
+
+from ..benchmarks.corpus import CORPUS
+
+# Tipos de ecuación que /solve resuelve directamente con el solver avanzado
+SYMBOLIC_TYPES = {"separable", "homogeneous", "linear", "bernoulli", "second_order_const", "reducible"}
+
+
+@dataclass
+class WorkItem:
+    kind: str
+    endpoint: str
+    payload: Dict
+
+
+def _symbolic_items(qwen_ratio: float, rng: random.Random) -> List[WorkItem]:
+    items = []
+    for case in CORPUS:
+        if case.is_system or case.equation_type not in SYMBOLIC_TYPES:
+            continue
+        payload = {
+            "equation": case.equations[0],
+            "equation_type": case.equation_type,
+            "with_qwen": rng.random() < qwen_ratio,
+        }
+        items.append(WorkItem("symbolic", "/solve", payload))
+    return items
+
+
+def _numeric_items(steps: int) -> List[WorkItem]:
+    items = []
+    for case in CORPUS:
+        if case.is_system or case.initial is None:
+            continue
+        for method in ("numeric:euler", "numeric:rk4"):
+            payload = {
+                "equation": case.equations[0],
+                "method": method,
+                "initial_conditions": {"x0": case.x0, "y0": case.initial[0]},
+                "step": 0.01,
+                "steps": steps,
+            }
+            items.append(WorkItem("numeric", "/solve", payload))
+    return items
+
+
+def _system_items(steps: int) -> List[WorkItem]:
+    items = []
+    for case in CORPUS:
+        if not case.is_system:
+            continue
+        payload = {
+            "equations": case.equations,
+            "variables": case.variables,
+            "method": "numeric:rk4",
+            "initial_conditions": {"x0": case.x0, "y0": case.initial[0], "system": case.initial},
+            "step": 0.01,
+            "steps": steps,
+        }
+        items.append(WorkItem("system", "/solve/system", payload))
+    return items
+
+
+class Workload:
+    """Elige peticiones al azar según los pesos de la mezcla (p. ej. symbolic=5,numeric=3)."""
+
+    def __init__(self, mix: Dict[str, float], steps: int = 200, qwen_ratio: float = 0.0, seed: int = 0):
+        self.rng = random.Random(seed)
+        pools = {
+            "symbolic": _symbolic_items(qwen_ratio, self.rng),
+            "numeric": _numeric_items(steps),
+            "system": _system_items(steps),
+        }
+        unknown = set(mix) - set(pools)
+        if unknown:
+            raise ValueError(f"Tipos de carga desconocidos: {', '.join(sorted(unknown))}")
+        self.pools = {kind: pools[kind] for kind, weight in mix.items() if weight > 0}
+        self.kinds = list(self.pools)
+        self.weights = [mix[kind] for kind in self.kinds]
+
+    def next(self) -> WorkItem:
+        kind = self.rng.choices(self.kinds, weights=self.weights)[0]
+        return self.rng.choice(self.pools[kind])
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight) if weight else 1.0
+    return mix
@@ -8,7 +8,33 @@ class InitialConditions(BaseModel):
     y0: float
     y1: Optional[float] = None
     y2: Optional[float] = None
-    system: Optional[List[float]] = None  # Para sistemas: valores iniciales de cada variable
+    # Orden arbitrario: [y'(x0), y''(x0), ...]; reemplaza a y1/y2 si se indica
+    derivatives: Optional[List[float]] = None
+    # Para sistemas: valores iniciales del estado (cada variable y sus derivadas hasta orden k-1)
+    system: Optional[List[float]] = None
+
+
+class SampleOptions(BaseModel):
+    x_min: float
+    x_max: float
+    points: int = Field(default=200, ge=2, le=10000, description="Puntos en x (por eje en implícitas)")
+    y_min: float = Field(default=-10.0, description="Ventana en y para soluciones implícitas")
+    y_max: float = Field(default=10.0, description="Ventana en y para soluciones implícitas")
+    constants: Optional[Dict[str, float]] = Field(
+        default=None, description="Valores para constantes libres (C1, C2, ...) sin CI"
+    )
+
+
+class AccuracyOptions(BaseModel):
+    tolerance: float = Field(default=1e-6, gt=0, description="Error global objetivo para sugerir pasos")
+    compare_symbolic: bool = Field(
+        default=True, description="Comparar con la solución simbólica si es barata de obtener"
+    )
+
+
+class SeriesOptions(BaseModel):
+    terms: int = Field(default=8, ge=1, description="Coeficientes por serie; al pedir más se reutilizan los ya calculados")
+    x0: Optional[float] = Field(default=None, description="Centro de la serie (por defecto x0 de las CI o 0)")
 
 
 class SolveRequest(BaseModel):
@@ -16,26 +42,97 @@ class SolveRequest(BaseModel):
     equation_type: Optional[str] = Field(
         default=None, description="Tipo de ecuación (separable, linear, exact, etc.)"
     )
-    method: Literal["symbolic", "numeric:euler", "numeric:rk4"] = "symbolic"
+    method: Literal[
+        "symbolic",
+        "numeric:euler",
+        "numeric:rk4",
+        "numeric:verlet",
+        "numeric:leapfrog",
+        "numeric:yoshida4",
+        "series",
+    ] = "symbolic"
     initial_conditions: Optional[InitialConditions] = None
     step: Optional[float] = Field(default=0.1, description="Tamaño de paso para métodos numéricos")
     steps: Optional[int] = Field(default=50, description="Número de iteraciones para métodos numéricos")
     with_qwen: bool = Field(default=False, description="Solicitar validación o explicación con Qwen")
+    events: Optional[List[str]] = Field(
+        default=None, description="Funciones de evento g(x, y); se registra cada cruce por cero (solo numérico)"
+    )
+    stop_on_event: bool = Field(default=False, description="Detener la integración en el primer evento")
+    accuracy: Optional[AccuracyOptions] = Field(
+        default=None, description="Estimar el error de la trayectoria numérica (doblado de paso)"
+    )
+    precision: Literal["float64", "auto", "mpmath"] = Field(
+        default="float64", description="auto: float64 con escalado a mpmath si falla el chequeo de consistencia"
+    )
+    dps: Optional[int] = Field(default=None, ge=16, le=1000, description="Dígitos para mpmath (por defecto MP_DPS)")
+    series: Optional[SeriesOptions] = Field(
+        default=None, description="Opciones del método series (Taylor/Frobenius)"
+    )
+    sample: Optional[SampleOptions] = Field(
+        default=None, description="Evaluar la solución simbólica en una malla para graficar"
+    )
+    verify: bool = Field(default=False, description="Verificar la solución simbólica por residuo numérico")
+    profile: bool = Field(default=False, description="Perfilar la petición (requiere X-Admin-Token)")
+
+
+class PhasePortraitOptions(BaseModel):
+    u_min: float = Field(default=-5.0, description="Ventana de la primera variable")
+    u_max: float = 5.0
+    v_min: float = Field(default=-5.0, description="Ventana de la segunda variable")
+    v_max: float = 5.0
+    grid: int = Field(default=5, ge=1, le=20, description="Semillas por eje (grid x grid trayectorias)")
+    step: float = Field(default=0.05, gt=0)
+    steps: int = Field(default=200, ge=1, le=5000, description="Pasos RK4 en cada sentido")
 
 
 class SystemSolveRequest(BaseModel):
     equations: List[str]
     variables: Optional[List[str]] = None
-    method: Literal["numeric:euler", "numeric:rk4"] = "numeric:rk4"
-    initial_conditions: InitialConditions
+    method: Literal[
+        "numeric:euler",
+        "numeric:rk4",
+        "numeric:verlet",
+        "numeric:leapfrog",
+        "numeric:yoshida4",
+        "numeric:expm",
+    ] = "numeric:rk4"
+    initial_conditions: Optional[InitialConditions] = None
     step: Optional[float] = 0.1
     steps: Optional[int] = 50
+    precision: Literal["float64", "auto", "mpmath"] = "float64"
+    dps: Optional[int] = Field(default=None, ge=16, le=1000)
+    phase_portrait: Optional[PhasePortraitOptions] = Field(
+        default=None, description="Análisis de plano de fase (sistemas autónomos 2-D) en lugar de resolver"
+    )
     with_qwen: bool = False
+    profile: bool = False
 
 
 class ValidateRequest(BaseModel):
     equation: str
     proposed_solution: str
+    with_qwen: bool = Field(default=False, description="Pedir además una explicación a Qwen")
+
+
+class FieldRequest(BaseModel):
+    equation: str
+    x_min: float = -5.0
+    x_max: float = 5.0
+    y_min: float = -5.0
+    y_max: float = 5.0
+    nx: int = Field(default=21, ge=2, le=200, description="Puntos de la malla en x")
+    ny: int = Field(default=21, ge=2, le=200, description="Puntos de la malla en y")
+
+
+class FieldResponse(BaseModel):
+    originalEquation: str
+    x: List[Optional[float]]
+    y: List[Optional[float]]
+    # Vectores (1, f) normalizados, aplanados fila por fila: índice = j * nx + i
+    u: List[Optional[float]]
+    v: List[Optional[float]]
+    shape: List[int]
 
 
 class SolveResponse(BaseModel):
@@ -43,4 +140,31 @@ class SolveResponse(BaseModel):
     solution: Any
     steps: List[Dict[str, Any]]
     numeric_trace: Optional[List[Dict[str, float]]] = None
+    events: Optional[List[Dict[str, Any]]] = None
+    termination: Optional[str] = None
+    sample: Optional[Dict[str, Any]] = None
+    verification: Optional[Dict[str, Any]] = None
+    accuracy: Optional[Dict[str, Any]] = None
+    precision: Optional[Dict[str, Any]] = None
+    phase: Optional[Dict[str, Any]] = None
+    series: Optional[Dict[str, Any]] = None
+    # Complejidad medida, carril del pool y ruta elegida (fast, symbolic, numeric_fallback, requested)
+    routing: Optional[Dict[str, Any]] = None
+    # Prioridad, posición inicial en la cola del planificador y espera
+    scheduling: Optional[Dict[str, Any]] = None
     qwen_feedback: Optional[str] = None
+    profile: Optional[Dict[str, Any]] = None
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: Literal["solve", "system"]
+    status: Literal["queued", "running", "done", "failed", "cancelled"]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Hasta cuándo se conserva el resultado (finished_at + JOBS_TTL)
+    expires_at: Optional[float] = None
+    # steps_completed: pasos numéricos integrados (todas las pasadas); steps_requested: steps de la petición
+    progress: Dict[str, Optional[int]]
+    error: Optional[str] = None
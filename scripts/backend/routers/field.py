@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from ..models.schemas import FieldRequest, FieldResponse
+from ..services import metrics
+from .solve import Caller, admit, caller, scheduled
+
+router = APIRouter()
+
+
+@router.post("/field", response_model=FieldResponse)
+async def direction_field(req: FieldRequest, who: Caller = Depends(caller)):
+    with metrics.track_request("/field", "field", None):
+        lane = admit(req.equation)
+        try:
+            # Pasa por el planificador justo como /solve: cuenta para los límites por cliente
+            response, _, _ = await scheduled(lane, who, "field", req)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return response
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from ..services.worker_pool import pool
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {"status": "healthy", "solver": pool.state}
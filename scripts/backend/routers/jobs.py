@@ -0,0 +1,83 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from ..services import metrics, qwen_client
+from ..services.jobs import Job, TooManyJobs, store
+from ..services.worker_pool import pool
+from ..models.schemas import JobStatus, SolveRequest, SolveResponse, SystemSolveRequest
+from .solve import Caller, admit, caller, require_admin, run_solver
+
+router = APIRouter()
+
+
+def submit(kind: str, job: str, req, who: Caller, endpoint: str, equation_type: Optional[str]) -> JobStatus:
+    """Valida el tamaño de la entrada ya mismo y deja la resolución corriendo en segundo plano."""
+    lane = admit(*(req.equations if job == "solve_system" else [req.equation]))
+
+    async def run(control):
+        with metrics.track_request(endpoint, req.method, equation_type):
+            response = await run_solver(job, req, kind, who, lane=lane, control=control)
+        if kind == "solve" and req.with_qwen and not req.method.startswith("numeric"):
+            response.qwen_feedback = await qwen_client.ask_qwen(
+                f"Valida o mejora la solución {', '.join(response.solution)} para la ecuación: {req.equation}"
+            )
+        return response
+
+    steps = req.steps if req.method.startswith("numeric") else None
+    try:
+        created = store.submit(kind, who.client, run, mode=pool.mode, steps_requested=steps)
+    except TooManyJobs as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JobStatus(**created.as_dict())
+
+
+def find(job_id: str, who: Caller) -> Job:
+    """Trabajo del cliente que lo creó; para cualquier otro cliente no existe (404)."""
+    job = store.get(job_id)
+    if job is None or job.client != who.client:
+        raise HTTPException(status_code=404, detail="Trabajo inexistente o expirado.")
+    return job
+
+
+@router.post("/jobs/solve", response_model=JobStatus, status_code=202)
+async def submit_solve(
+    req: SolveRequest, who: Caller = Depends(caller), x_admin_token: Optional[str] = Header(default=None)
+):
+    if req.profile:
+        require_admin(x_admin_token)
+    return submit("solve", "solve", req, who, "/jobs/solve", req.equation_type)
+
+
+@router.post("/jobs/system", response_model=JobStatus, status_code=202)
+async def submit_system(
+    req: SystemSolveRequest, who: Caller = Depends(caller), x_admin_token: Optional[str] = Header(default=None)
+):
+    if req.profile:
+        require_admin(x_admin_token)
+    return submit("system", "solve_system", req, who, "/jobs/system", "sistema")
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def job_status(job_id: str, who: Caller = Depends(caller)):
+    return JobStatus(**find(job_id, who).as_dict())
+
+
+@router.get("/jobs/{job_id}/result", response_model=SolveResponse)
+async def job_result(job_id: str, who: Caller = Depends(caller)):
+    """Resultado de un trabajo terminado; 409 si todavía corre o fue cancelado, 400 si falló."""
+    job = find(job_id, who)
+    status = job.status
+    if status == "done":
+        return job.result
+    if status == "failed":
+        raise HTTPException(status_code=400, detail=job.error)
+    if status == "cancelled":
+        raise HTTPException(status_code=409, detail="El trabajo fue cancelado.")
+    raise HTTPException(status_code=409, detail=f"El trabajo aún no terminó (estado: {status}).")
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str, who: Caller = Depends(caller)):
+    """Cancela un trabajo en cola o en curso; si ya había terminado, descarta su resultado."""
+    return JobStatus(**store.cancel(find(job_id, who)).as_dict())
@@ -0,0 +1,125 @@
+"""
+Estimación del error de las trayectorias numéricas.
+
+Doblado de paso: se repite la integración con h/2 y se compara en los nodos
+comunes. Si el método es de orden p, el error global de la corrida con paso h
+es aproximadamente (y_h - y_{h/2}) * 2^p / (2^p - 1) (Richardson), y el número
+de pasos mínimo para una tolerancia sale de que ese error escala como h^p.
+
+Si la ecuación es de un tipo que dsolve resuelve rápido (ver CHEAP_HINTS) se
+compara además contra la solución simbólica del PVI.
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+import sympy as sp
+from sympy.utilities.lambdify import lambdify
+
+from .metrics import stage
+from .numeric_solver import integrate
+
+x = sp.symbols("x")
+
+ORDERS = {"euler": 1, "rk4": 4, "verlet": 2, "leapfrog": 2, "yoshida4": 4}
+
+# Clasificaciones que dsolve resuelve sin integrales costosas
+CHEAP_HINTS = (
+    "separable",
+    "1st_linear",
+    "Bernoulli",
+    "nth_linear_constant_coeff_homogeneous",
+    "nth_linear_constant_coeff_undetermined_coefficients",
+)
+
+
+def _first_component(ys) -> np.ndarray:
+    arr = np.asarray(ys, dtype=float)
+    return arr if arr.ndim == 1 else arr[:, 0]
+
+
+def _error_norm(diff: np.ndarray) -> np.ndarray:
+    return np.abs(diff) if diff.ndim == 1 else np.max(np.abs(diff), axis=1)
+
+
+def step_doubling(step, order: int, f, x0: float, y0, h: float, res) -> Dict:
+    """Error global estimado por punto comparando con una corrida a paso h/2."""
+    # Con stop_on_event el último punto es el evento, fuera de la malla regular
+    n = len(res.xs) - 1 - (1 if res.status == "event" else 0)
+    fine = integrate(step, f, x0, y0, h / 2, 2 * n)
+    # Si la corrida fina terminó antes (desborde), se compara lo que haya en común
+    m = min(n, (len(fine.xs) - 1) // 2)
+    coarse = np.asarray(res.ys[: m + 1], dtype=float)
+    fine_nodes = np.asarray(fine.ys[: 2 * m + 1 : 2], dtype=float)
+    factor = 2**order / (2**order - 1)
+    errors = _error_norm((coarse - fine_nodes) * factor)
+    extrapolated = fine_nodes + (fine_nodes - coarse) / (2**order - 1)
+    return {"errors": errors, "extrapolated": extrapolated, "points": m + 1}
+
+
+def suggested_steps(n: int, max_error: float, tolerance: float, order: int) -> int:
+    """Pasos mínimos sobre el mismo intervalo para que el error global quede bajo la tolerancia."""
+    if max_error <= tolerance or max_error == 0:
+        return n
+    return max(1, math.ceil(n * (max_error / tolerance) ** (1.0 / order)))
+
+
+def symbolic_reference(eq, x0: float, y0, xs) -> Optional[np.ndarray]:
+    """Valores de la solución exacta del PVI en xs, o None si no es barata de obtener.
+
+    y0 es escalar o el estado (y, y', ..., y^(n-1)) de una EDO de orden n.
+    """
+    from .advanced_solver import advanced_solver
+
+    func = sp.Function("y")(x)
+    try:
+        hints = sp.classify_ode(eq, func)
+        if not any(hint in CHEAP_HINTS for hint in hints):
+            return None
+        ics = {
+            (func.diff(x, k) if k else func).subs(x, x0): float(v)
+            for k, v in enumerate(np.atleast_1d(y0))
+        }
+        sol = advanced_solver.dsolve_cached(eq, func, ics=ics)
+        sol = sol[0] if isinstance(sol, list) else sol
+        if sol.lhs != func or sol.rhs.has(func) or sol.rhs.free_symbols - {x}:
+            return None
+        g = lambdify(x, sol.rhs, modules="numpy")
+        with np.errstate(all="ignore"):
+            values = np.broadcast_to(np.asarray(g(np.asarray(xs, dtype=float)), dtype=complex), (len(xs),))
+        if np.any(np.abs(values.imag) > 1e-12):
+            return None
+        return values.real
+    except Exception:
+        return None
+
+
+def accuracy_report(method: str, step, f, eq, x0: float, y0, h: float, res, opts) -> Dict:
+    """Reporte de precisión de una trayectoria numérica ya calculada."""
+    order = ORDERS[method.split(":")[-1]]
+    n = len(res.xs) - 1
+    with stage("accuracy"):
+        doubling = step_doubling(step, order, f, x0, y0, h, res)
+        errors = doubling["errors"]
+        max_error = float(np.max(errors)) if len(errors) else 0.0
+        report = {
+            "order": order,
+            "tolerance": opts.tolerance,
+            "error_estimates": [float(e) for e in errors],
+            "extrapolated": _first_component(doubling["extrapolated"]).tolist(),
+            "max_error_estimate": max_error,
+            "final_error_estimate": float(errors[-1]) if len(errors) else 0.0,
+            "suggested_steps": suggested_steps(n, max_error, opts.tolerance, order),
+            "symbolic": None,
+        }
+        report["suggested_step"] = h * n / report["suggested_steps"] if n else h
+        if opts.compare_symbolic and eq is not None:
+            exact = symbolic_reference(eq, x0, y0, res.xs)
+            if exact is not None:
+                abs_errors = np.abs(_first_component(res.ys) - exact)
+                report["symbolic"] = {
+                    "errors": abs_errors.tolist(),
+                    "max_abs_error": float(np.max(abs_errors)),
+                }
+    return report
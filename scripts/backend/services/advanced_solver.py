@@ -3,9 +3,16 @@ Adaptación del ODESolver del backend de Carlos para uso como servicio en FastAP
 Incluye métodos de primer orden (separable, homogéneas, exactas, lineales, Bernoulli,
 factor integrante) y segundo orden (coeficientes constantes, reducibles), con soporte
 de condiciones iniciales y salidas en texto/LaTeX.
+
+Los PVI lineales de coeficientes constantes (con forzamientos escalón/impulso) se
+resuelven por transformada de Laplace: tabla de transformadas precalculada para el
+forzamiento e inversión por fracciones parciales, sin pasar por dsolve.
 """
 
 import re
+import threading
+from collections import OrderedDict
+
 import sympy as sp
 from sympy import (
     Eq,
@@ -15,9 +22,8 @@ from sympy import (
     diff,
     dsolve,
     exp,
-    integrate,
     latex,
-    simplify,
+    log,
     sqrt,
 )
 from sympy.parsing.sympy_parser import (
@@ -26,6 +32,40 @@ from sympy.parsing.sympy_parser import (
     standard_transformations,
 )
 
+from sympy.solvers.ode.ode import solve_ics
+
+from ..config import settings
+from .memo import integrate_cached, simplify_cached
+from .metrics import record_cache, stage
+
+_s, _t = symbols("_s _t")
+
+# L{k(w t + phi)}(s) para los núcleos soportados (exp y t^n se aplican como desplazamiento y derivada en s)
+LAPLACE_TABLE = {
+    None: lambda w, phi: 1 / _s,
+    sp.sin: lambda w, phi: (sp.sin(phi) * _s + sp.cos(phi) * w) / (_s**2 + w**2),
+    sp.cos: lambda w, phi: (sp.cos(phi) * _s - sp.sin(phi) * w) / (_s**2 + w**2),
+    sp.sinh: lambda w, phi: (sp.sinh(phi) * _s + sp.cosh(phi) * w) / (_s**2 - w**2),
+    sp.cosh: lambda w, phi: (sp.cosh(phi) * _s + sp.sinh(phi) * w) / (_s**2 - w**2),
+}
+
+
+def _linear_in(expr, var):
+    """(pendiente, ordenada) numéricas si expr = a*var + b; None en otro caso."""
+    try:
+        poly = sp.Poly(expr, var)
+    except sp.PolynomialError:
+        return None
+    if poly.degree() > 1 or not all(c.is_number for c in poly.all_coeffs()):
+        return None
+    a, b = (poly.all_coeffs() if poly.degree() == 1 else [sp.S.Zero, poly.as_expr()])
+    return a, b
+
+
+def _rational(value):
+    value = sp.sympify(value)
+    return sp.nsimplify(value, rational=True) if value.has(sp.Float) else value
+
 
 class ODESolver:
     def __init__(self):
@@ -55,8 +95,16 @@ class ODESolver:
             "sinh": sp.sinh,
             "cosh": sp.cosh,
             "tanh": sp.tanh,
+            "Heaviside": sp.Heaviside,
+            "DiracDelta": sp.DiracDelta,
         }
         self.transformations = standard_transformations + (implicit_multiplication_application,)
+        # Soluciones generales (C1, C2 libres) por ecuación canónica, con desalojo LRU
+        self._general_cache = OrderedDict()
+        self._general_lock = threading.Lock()
+        # Derivaciones (solución general + pasos) por (tipo, ecuación)
+        self._derivation_cache = OrderedDict()
+        self._derivation_lock = threading.Lock()
 
     # ------------------ Utilidades de formato ------------------ #
     def format_solution(self, solution):
@@ -105,13 +153,21 @@ class ODESolver:
         return parse_expr(expr, local_dict=loc, transformations=self.transformations)
 
     def _prepare_ics(self, initial_conditions):
-        if not initial_conditions:
+        """
+        CI {'x0', 'y0', 'yp0', 'ypp0', 'derivatives'} -> dict de dsolve.
+        `derivatives` lista y'(x0), y''(x0), ... de cualquier orden; yp0/ypp0
+        tienen prioridad sobre sus dos primeras entradas.
+        """
+        if not isinstance(initial_conditions, dict):
             return None
-        x0 = initial_conditions.get("x0") if isinstance(initial_conditions, dict) else None
-        y0 = initial_conditions.get("y0") if isinstance(initial_conditions, dict) else None
-        yp0 = initial_conditions.get("yp0") if isinstance(initial_conditions, dict) else None
-        ypp0 = initial_conditions.get("ypp0") if isinstance(initial_conditions, dict) else None
-        if not any([y0, yp0, ypp0]):
+        x0 = initial_conditions.get("x0")
+        y0 = initial_conditions.get("y0")
+        derivatives = list(initial_conditions.get("derivatives") or [])
+        derivatives += [None] * (2 - len(derivatives))
+        for k, key in enumerate(("yp0", "ypp0")):
+            if initial_conditions.get(key) is not None:
+                derivatives[k] = initial_conditions[key]
+        if y0 is None and all(v is None for v in derivatives):
             return None
         if x0 is None:
             raise ValueError("Debe especificar x0 para aplicar condiciones iniciales")
@@ -120,17 +176,516 @@ class ODESolver:
             ics = {}
             if y0 is not None:
                 ics[self.y(self.x).subs(self.x, x0)] = sp.sympify(y0)
-            if yp0 is not None:
-                ics[diff(self.y(self.x), self.x).subs(self.x, x0)] = sp.sympify(yp0)
-            if ypp0 is not None:
-                ics[diff(self.y(self.x), self.x, 2).subs(self.x, x0)] = sp.sympify(ypp0)
+            for k, value in enumerate(derivatives, start=1):
+                if value is not None:
+                    ics[diff(self.y(self.x), self.x, k).subs(self.x, x0)] = sp.sympify(value)
             return ics or None
         except (sp.SympifyError, ValueError) as exc:
             raise ValueError(f"Condiciones iniciales inválidas: {exc}")
 
     def _dsolve(self, eq, y, initial_conditions=None):
+        return self.dsolve_cached(eq, y, self._prepare_ics(initial_conditions))
+
+    def dsolve_cached(self, eq, y, ics=None):
+        """
+        dsolve con caché de la solución general: un PVI sobre una ecuación ya
+        vista solo resuelve el sistema algebraico de las constantes.
+        """
+        if ics:
+            with stage("laplace"):
+                solution = self.laplace_ivp(eq, y, ics)
+            if solution is not None:
+                return solution
+        general = self.general_solution(eq, y)
+        if not ics:
+            return general
+        try:
+            with stage("ics"):
+                return self._apply_ics(eq, y, general, ics)
+        except (ValueError, NotImplementedError):
+            # Misma ruta que antes; dsolve reporta el error si las CI no tienen solución
+            with stage("dsolve"):
+                return dsolve(eq, y, ics=ics)
+
+    def general_solution(self, eq, y):
+        expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+        key = (sp.srepr(expr), sp.srepr(y))
+        with self._general_lock:
+            cached = self._general_cache.get(key)
+            if cached is not None:
+                self._general_cache.move_to_end(key)
+        record_cache("general_solution", cached is not None)
+        if cached is not None:
+            return cached
+        with stage("dsolve"):
+            general = dsolve(eq, y)
+        with self._general_lock:
+            self._general_cache[key] = general
+            while len(self._general_cache) > settings.GENERAL_SOLUTION_CACHE_SIZE:
+                self._general_cache.popitem(last=False)
+        return general
+
+    def _apply_ics(self, eq, y, general, ics):
+        """Resuelve las constantes de la solución general (como hace dsolve con ics)."""
+        free = eq.free_symbols
+        sols = general if isinstance(general, list) else [general]
+        applied = []
+        for sol in sols:
+            try:
+                constants = solve_ics([sol], [y], sol.free_symbols - free, ics)
+            except ValueError:
+                continue
+            applied.append(sol.subs(constants))
+        if not applied:
+            raise ValueError("No se pudieron aplicar las condiciones iniciales")
+        return applied[0] if len(applied) == 1 else applied
+
+    # ------------------ Transformada de Laplace ------------------ #
+    def laplace_ivp(self, eq, y, ics):
+        """
+        PVI lineal de coeficientes constantes por transformada de Laplace.
+        Devuelve Eq(y, solución) o None si la ecuación, las CI o el forzamiento
+        quedan fuera de la tabla (en ese caso se usa dsolve). Los saltos del
+        forzamiento conservan su Heaviside, así la solución vale también para
+        x < x0; si alguno ocurre antes de x0 (retardo negativo) se usa dsolve.
+        """
+        x = self.x
+        expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+        order = max((d.derivative_count for d in expr.atoms(sp.Derivative) if d.expr == y), default=0)
+        if order == 0:
+            return None
+        slots = symbols(f"_d0:{order + 1}")
+        derivatives = [y] + [y.diff(x, k) for k in range(1, order + 1)]
+        flat = expr.xreplace(dict(zip(derivatives, slots)))
+        if flat.has(y.func):
+            return None
+        coeffs = [_rational(flat.diff(d)) for d in slots]
+        if any(not c.is_number for c in coeffs) or coeffs[-1] == 0:
+            return None
+        forcing = -(flat - sum(c * d for c, d in zip(coeffs, slots)))
+        if forcing.has(*slots):
+            return None
+
+        initial = self._laplace_ics(y, ics, order)
+        if initial is None:
+            return None
+        x0, values = initial
+        groups = self._forcing_transform(_rational(forcing).subs(x, _t + x0))
+        if groups is None:
+            return None
+
+        # P(s) Y = G(s) + Q(s), con Q de las CI: L{y^(k)} = s^k Y - sum s^(k-1-j) y^(j)(0)
+        P = sum(c * _s**k for k, c in enumerate(coeffs))
+        Q = sum(c * sum(_s ** (k - 1 - j) * values[j] for j in range(k)) for k, c in enumerate(coeffs))
+        groups[None] = groups.get(None, 0) + Q
+        solution = sp.S.Zero
+        for delay, G in groups.items():
+            f = self._inverse_laplace(G / P)
+            if f is None:
+                return None
+            solution += f if delay is None else sp.Heaviside(_t - delay) * f.subs(_t, _t - delay)
+        return Eq(y, solution.subs(_t, x - x0))
+
+    def _laplace_ics(self, y, ics, order):
+        """(x0, [y(x0), y'(x0), ...]) si las CI dan el estado completo en un único punto."""
+        x0, values = None, {}
+        for key, val in ics.items():
+            if isinstance(key, sp.Subs) and isinstance(key.expr, sp.Derivative) and key.expr.expr == y:
+                k, point = key.expr.derivative_count, key.point[0]
+            elif isinstance(key, sp.Derivative) and key.expr == y:
+                k, point = key.derivative_count, self.x
+            elif key.func == y.func:
+                k, point = 0, key.args[0]
+            else:
+                return None
+            if x0 is not None and point != x0:
+                return None
+            x0, values[k] = point, _rational(val)
+        if x0 is None or not x0.is_number or sorted(values) != list(range(order)):
+            return None
+        return _rational(x0), [values[k] for k in range(order)]
+
+    def _forcing_transform(self, g):
+        """
+        Transformada del forzamiento agrupada por retardo: {c: R(s)} con
+        L{g} = sum e^(-c s) R(s); la clave None agrupa los términos sin salto.
+        None si algún salto o impulso ocurre en t < 0: la transformada lo
+        vería como parte del término sin salto y la solución solo valdría
+        para t >= 0.
+        """
+
+        def step(arg, *_):
+            line = _linear_in(arg, _t)
+            # H(c - t) = 1 - H(t - c) salvo en el salto
+            return 1 - sp.Heaviside(-arg) if line and line[0] < 0 else sp.Heaviside(arg)
+
+        g = sp.expand(g.replace(sp.Heaviside, step))
+        groups = {}
+        for term in sp.Add.make_args(g):
+            if term == 0:
+                continue
+            switches = [f for f in sp.Mul.make_args(term) if isinstance(f, (sp.Heaviside, sp.DiracDelta))]
+            if len(switches) > 1:
+                return None
+            if not switches:
+                delay, R = None, self._basic_transform(term)
+            else:
+                switch = switches[0]
+                line = _linear_in(switch.args[0], _t)
+                # DiracDelta(t, k) con k > 0 es una derivada del impulso (Heaviside guarda H(0) como 2º arg)
+                if line is None or line[0] == 0 or (isinstance(switch, sp.DiracDelta) and len(switch.args) > 1):
+                    return None
+                delay = -line[1] / line[0]
+                if delay < 0:
+                    return None
+                rest = term / switch
+                if isinstance(switch, sp.DiracDelta):
+                    R = rest.subs(_t, delay) / abs(line[0])
+                else:
+                    R = self._basic_transform(sp.expand(rest.subs(_t, _t + delay)))
+            if R is None:
+                return None
+            groups[delay] = groups.get(delay, 0) + R
+        return groups
+
+    def _basic_transform(self, g):
+        """L{g} para sumas de c * t^n * e^(a t) * k(w t + phi) con k de LAPLACE_TABLE."""
+        total = sp.S.Zero
+        for term in sp.Add.make_args(g):
+            coeff, n, shift, kernel = sp.S.One, 0, sp.S.Zero, (None, 0, 0)
+            for f in sp.Mul.make_args(term):
+                if not f.has(_t):
+                    coeff *= f
+                elif f == _t:
+                    n += 1
+                elif f.is_Pow and f.base == _t and f.exp.is_Integer and f.exp > 0:
+                    n += int(f.exp)
+                elif isinstance(f, sp.exp) and _linear_in(f.args[0], _t):
+                    a, b = _linear_in(f.args[0], _t)
+                    shift, coeff = shift + a, coeff * sp.exp(b)
+                elif f.func in LAPLACE_TABLE and kernel[0] is None and _linear_in(f.args[0], _t):
+                    kernel = (f.func, *_linear_in(f.args[0], _t))
+                else:
+                    return None
+            F = LAPLACE_TABLE[kernel[0]](kernel[1], kernel[2]).subs(_s, _s - shift)
+            total += coeff * (-1) ** n * sp.diff(F, _s, n)
+        return total
+
+    def _inverse_laplace(self, F):
+        """Inversa por fracciones parciales: cada fracción simple se invierte con su fórmula cerrada."""
+        F = sp.cancel(F)
+        if F == 0:
+            return sp.S.Zero
+        with stage("apart"):
+            pieces = sp.Add.make_args(sp.apart(F, _s))
+        total = sp.S.Zero
+        for piece in pieces:
+            f = self._inverse_piece(piece)
+            if f is None:
+                return None
+            total += f
+        return total
+
+    def _inverse_piece(self, piece):
+        num, den = sp.fraction(sp.together(piece))
+        if not den.has(_s):
+            return None  # Parte polinómica: impulsos en la solución
+        const, factors = sp.factor_list(den, _s)
+        if len(factors) != 1:
+            return None
+        base, k = factors[0]
+        poly = sp.Poly(base, _s)
+        lc = poly.LC()
+        num = sp.Poly(num, _s)
+        if num.degree() >= poly.degree():
+            return None
+        scale = const * lc**k
+        t = _t
+        if poly.degree() == 1:
+            # A/(s - r)^k -> A t^(k-1) e^(r t) / (k-1)!
+            r = -poly.monic().all_coeffs()[1]
+            return num.as_expr() / scale * t ** (k - 1) * sp.exp(r * t) / sp.factorial(k - 1)
+        if poly.degree() != 2:
+            return None
+        _, p, q = poly.monic().all_coeffs()
+        B, C = (num.all_coeffs() if num.degree() == 1 else [sp.S.Zero, num.as_expr()])
+        B, C = B / scale, C / scale
+        # (B s + C)/((s - a)^2 + d)^k = (B (s - a) + D)/(...)^k con D = C + B a
+        a, d = -p / 2, q - p**2 / 4
+        D = C + B * a
+        if not d.is_number or d == 0:
+            return None
+        if d > 0:
+            w = sp.sqrt(d)
+            if k == 1:
+                core = B * sp.cos(w * t) + D / w * sp.sin(w * t)
+            elif k == 2:
+                core = B * t * sp.sin(w * t) / (2 * w) + D * (sp.sin(w * t) - w * t * sp.cos(w * t)) / (2 * w**3)
+            else:
+                return None
+        else:
+            if k != 1:
+                return None
+            w = sp.sqrt(-d)
+            core = B * sp.cosh(w * t) + D / w * sp.sinh(w * t)
+        return sp.exp(a * t) * core
+
+    # ------------------ Derivaciones paso a paso ------------------ #
+    def derivation(self, kind, eq, y):
+        """
+        Solución general obtenida con el método clásico del tipo (lineal, Bernoulli,
+        homogénea) junto con sus pasos intermedios; None si la ecuación no tiene esa
+        forma o alguna integral no se puede evaluar. Se cachea por ecuación.
+        """
+        expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+        builders = {
+            "linear": self._derive_linear,
+            "bernoulli": self._derive_bernoulli,
+            "homogeneous": self._derive_homogeneous,
+        }
+        return self._cached_derivation((kind, sp.srepr(expr)), lambda: builders[kind](eq, y))
+
+    def _cached_derivation(self, key, build):
+        with self._derivation_lock:
+            hit = key in self._derivation_cache
+            if hit:
+                self._derivation_cache.move_to_end(key)
+                result = self._derivation_cache[key]
+        record_cache("derivation", hit)
+        if hit:
+            return result
+        with stage("derivation"):
+            try:
+                result = build()
+            except (NotImplementedError, ValueError, TypeError):
+                result = None
+        with self._derivation_lock:
+            self._derivation_cache[key] = result
+            while len(self._derivation_cache) > settings.GENERAL_SOLUTION_CACHE_SIZE:
+                self._derivation_cache.popitem(last=False)
+        return result
+
+    def _explicit_rhs(self, eq, y):
+        """f(x, Y) con y' = f(x, y) (Y símbolo en lugar de y), o None si no es de primer orden."""
+        expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+        dy = y.diff(self.x)
+        if any(d.expr == y and d.derivative_count > 1 for d in expr.atoms(sp.Derivative)):
+            return None
+        a = expr.diff(dy)
+        if a == 0 or a.has(dy):
+            return None
+        Y = sp.Dummy("Y")
+        return (-(expr.subs(dy, 0)) / a).subs(y, Y), Y
+
+    def _explicit_powers(self, eq, y):
+        """Agrupa f de y' = f(x, y) por potencias de y: {k: coeficiente(x)}."""
+        explicit = self._explicit_rhs(eq, y)
+        if explicit is None:
+            return None
+        f, Y = explicit
+        powers = {}
+        for term in sp.Add.make_args(sp.expand(f)):
+            coeff, dep = term.as_independent(Y, as_Add=False)
+            if dep == 1:
+                k = sp.S.Zero
+            elif dep == Y:
+                k = sp.S.One
+            elif dep.is_Pow and dep.base == Y and not dep.exp.has(self.x, Y):
+                k = dep.exp
+            else:
+                return None
+            powers[k] = powers.get(k, 0) + coeff
+        powers = {k: simplify_cached(c) for k, c in powers.items()}
+        return {k: c for k, c in powers.items() if c != 0}
+
+    def _integrating_factor_steps(self, P, Q, func, C):
+        """y' + P y = Q por factor integrante; devuelve (y, pasos) o None si una integral no cierra."""
+        x = self.x
+        mu = simplify_cached(exp(integrate_cached(P, x)))
+        muQ = simplify_cached(mu * Q)
+        integral = integrate_cached(muQ, x)
+        if mu.has(sp.Integral) or integral.has(sp.Integral):
+            return None
+        general = simplify_cached((integral + C) / mu)
+        steps = [
+            {
+                "title": "Forma estándar",
+                "description": "Se escribe la ecuación como y' + P(x) y = Q(x).",
+                "equation": latex(Eq(func.diff(x) + P * func, Q, evaluate=False)),
+            },
+            {
+                "title": "Factor integrante",
+                "description": "Se calcula μ(x) = e^{∫P(x) dx}.",
+                "equation": f"\\mu(x) = e^{{\\int {latex(P)}\\,dx}} = {latex(mu)}",
+            },
+            {
+                "title": "Multiplicar por μ(x)",
+                "description": "El lado izquierdo queda como la derivada del producto μ(x) y.",
+                "equation": f"\\frac{{d}}{{dx}}\\left[{latex(mu * func)}\\right] = {latex(muQ)}",
+            },
+            {
+                "title": "Integrar",
+                "description": "Se integran ambos lados respecto de x.",
+                "equation": f"{latex(mu * func)} = \\int {latex(muQ)}\\,dx = {latex(integral + C)}",
+            },
+            {
+                "title": "Despejar",
+                "description": "Se divide por μ(x).",
+                "equation": latex(Eq(func, general)),
+            },
+        ]
+        return general, steps
+
+    def _derive_linear(self, eq, y):
+        powers = self._explicit_powers(eq, y)
+        if powers is None or not set(powers) <= {0, 1}:
+            return None
+        result = self._integrating_factor_steps(-powers.get(1, 0), powers.get(0, 0), y, self.C1)
+        if result is None:
+            return None
+        general, steps = result
+        return Eq(y, general), steps
+
+    def _derive_bernoulli(self, eq, y):
+        powers = self._explicit_powers(eq, y)
+        if powers is None:
+            return None
+        exponents = [k for k in powers if k not in (0, 1)]
+        if len(exponents) != 1 or 0 in powers:
+            return None
+        n = exponents[0]
+        P, Q = -powers.get(1, 0), powers[n]
+        v = Function("v")(self.x)
+        result = self._integrating_factor_steps((1 - n) * P, (1 - n) * Q, v, self.C1)
+        if result is None:
+            return None
+        v_general, linear_steps = result
+        # y^(1-n) = v con 1 - n = p/q da y^p = v^q: una rama por cada raíz p-ésima de la unidad, como dsolve
+        branches = abs((1 - n).p) if (1 - n).is_Rational else 1
+        root = v_general ** (1 / (1 - n))
+        solutions = [Eq(y, sp.expand_complex(sp.root(1, branches, k)) * root) for k in range(branches)]
+        if branches == 1:
+            back = "Se deshace la sustitución y = v^(1/(1-n))."
+        else:
+            back = f"Se deshace la sustitución: y^({1 - n}) = v tiene {branches} ramas (raíces {branches}-ésimas de la unidad)."
+        steps = [
+            {
+                "title": "Forma de Bernoulli",
+                "description": f"La ecuación tiene la forma y' + P(x) y = Q(x) y^n con n = {n}.",
+                "equation": latex(Eq(y.diff(self.x) + P * y, Q * y**n, evaluate=False)),
+            },
+            {
+                "title": "Sustitución",
+                "description": f"Con v = y^(1-n) = y^({1 - n}) la ecuación se vuelve lineal en v.",
+                "equation": latex(Eq(v.diff(self.x) + (1 - n) * P * v, (1 - n) * Q, evaluate=False)),
+            },
+            *linear_steps,
+            {
+                "title": "Volver a y",
+                "description": back,
+                "equation": ",\\quad ".join(latex(sol) for sol in solutions),
+            },
+        ]
+        return (solutions[0] if branches == 1 else solutions), steps
+
+    def _derive_homogeneous(self, eq, y):
+        explicit = self._explicit_rhs(eq, y)
+        if explicit is None:
+            return None
+        (f, Y), x, V = explicit, self.x, sp.Dummy("v")
+        G = simplify_cached(f.subs(Y, V * x))
+        if G.has(x):
+            return None
+        v = Function("v")(x)
+        steps = [
+            {
+                "title": "Ecuación homogénea",
+                "description": "f(x, y) solo depende de y/x: y' = G(y/x).",
+                "equation": latex(Eq(y.diff(x), G.subs(V, y / x), evaluate=False)),
+            },
+            {
+                "title": "Sustitución",
+                "description": "Con y = v x se tiene y' = v + x v'.",
+                "equation": latex(Eq(v + x * v.diff(x), G.subs(V, v), evaluate=False)),
+            },
+        ]
+        separated = simplify_cached(G - V)
+        if separated == 0:
+            steps.append({"title": "Resultado", "description": "v' = 0, entonces v es constante.", "equation": ""})
+            return Eq(y, self.C1 * x), steps
+        integral = integrate_cached(1 / separated, V)
+        if integral.has(sp.Integral):
+            return None
+        steps += [
+            {
+                "title": "Separar variables",
+                "description": "Se separan v y x.",
+                "equation": f"\\int {latex(1 / separated.subs(V, v))}\\,dv = \\int \\frac{{1}}{{x}}\\,dx",
+            },
+            {
+                "title": "Integrar",
+                "description": "Se integran ambos lados.",
+                "equation": latex(Eq(integral.subs(V, v), log(x) + self.C1)),
+            },
+        ]
+        # Si la integral es lineal en v se despeja; si no, la solución queda implícita
+        line = sp.Poly(integral, V) if integral.is_polynomial(V) else None
+        if line is not None and line.degree() == 1:
+            a, b = line.all_coeffs()
+            solution = Eq(y, x * (log(x) + self.C1 - b) / a)
+        else:
+            solution = Eq(integral.subs(V, y / x), log(x) + self.C1)
+        steps.append({"title": "Volver a y", "description": "Se sustituye v = y/x.", "equation": latex(solution)})
+        return solution, steps
+
+    def _derive_exact(self, M, N, x, y):
+        """F(x, y) = C con F_x = M y F_y = N; pasos con las integrales parciales."""
+        F_x = integrate_cached(M, x)
+        g_prime = simplify_cached(N - diff(F_x, y))
+        g_y = integrate_cached(g_prime, y)
+        F = simplify_cached(F_x + g_y)
+        solution_eq = Eq(F, Symbol("C"))
+        steps = [
+            {
+                "title": "Condición de exactitud",
+                "description": "Se verifica ∂M/∂y = ∂N/∂x.",
+                "equation": f"\\frac{{\\partial M}}{{\\partial y}} = {latex(diff(M, y))} = \\frac{{\\partial N}}{{\\partial x}}",
+            },
+            {
+                "title": "Integrar M respecto de x",
+                "description": "F(x, y) = ∫M dx + g(y).",
+                "equation": f"F(x, y) = \\int {latex(M)}\\,dx = {latex(F_x)} + g(y)",
+            },
+            {
+                "title": "Determinar g(y)",
+                "description": "Derivando F respecto de y e igualando a N se obtiene g'(y).",
+                "equation": f"g'(y) = {latex(g_prime)} \\Rightarrow g(y) = {latex(g_y)}",
+            },
+            {
+                "title": "Solución implícita",
+                "description": "La solución general es F(x, y) = C.",
+                "equation": latex(solution_eq),
+            },
+        ]
+        return solution_eq, steps
+
+    def _with_ics(self, eq, y, general, steps, initial_conditions):
+        """Aplica las CI a una solución derivada y agrega el paso correspondiente."""
         ics = self._prepare_ics(initial_conditions)
-        return dsolve(eq, y, ics=ics) if ics else dsolve(eq, y)
+        if not ics:
+            return general, steps
+        try:
+            with stage("ics"):
+                particular = self._apply_ics(eq, y, general, ics)
+        except (ValueError, NotImplementedError):
+            return self.dsolve_cached(eq, y, ics), None
+        ic_text = ", ".join(f"{latex(k)} = {latex(v)}" for k, v in ics.items())
+        step = {
+            "title": "Condiciones iniciales",
+            "description": "Se determina la constante con las condiciones iniciales.",
+            "equation": f"{ic_text} \\Rightarrow {self.get_latex_solution(particular)}",
+        }
+        return particular, [*steps, step]
 
     # ------------------ Métodos de resolución ------------------ #
     def solve_separable(self, equation_str, initial_conditions=None):
@@ -166,10 +721,15 @@ class ODESolver:
             special_solution = self._solve_special_cases(eq)
             if special_solution:
                 return special_solution
+            derived = self.derivation("homogeneous", eq, y)
+            if derived:
+                solution, steps = self._with_ics(eq, y, *derived, initial_conditions)
+                return self._ok(solution, "Ecuación Homogénea", extra={"steps": steps})
             solution = self._dsolve(eq, y, initial_conditions)
             if isinstance(solution, list):
                 solution = solution[0]
-            return self._ok(simplify(solution), "Ecuación Homogénea")
+            solution = simplify_cached(solution)
+            return self._ok(solution, "Ecuación Homogénea")
         except Exception as e:
             return self._fail(e, "Ecuación Homogénea")
 
@@ -189,13 +749,12 @@ class ODESolver:
             N = self._parse(N_str, local_dict=local_symbols)
             dM_dy = diff(M, y)
             dN_dx = diff(N, x)
-            is_exact = simplify(dM_dy - dN_dx) == 0
+            is_exact = simplify_cached(dM_dy - dN_dx) == 0
             if is_exact:
-                F = integrate(M, x)
-                g_y = integrate(N - diff(F, y), y)
-                F = F + g_y
-                solution_eq = Eq(sp.simplify(F), Symbol("C"))
-                return self._ok(solution_eq, "Ecuación Exacta", extra={"is_exact": True})
+                solution_eq, steps = self._cached_derivation(
+                    ("exact", sp.srepr((M, N))), lambda: self._derive_exact(M, N, x, y)
+                )
+                return self._ok(solution_eq, "Ecuación Exacta", extra={"is_exact": True, "steps": steps})
             else:
                 return {
                     "success": False,
@@ -215,6 +774,10 @@ class ODESolver:
                 eq = Eq(self._parse(lhs), self._parse(rhs))
             else:
                 eq = self._parse(eq_str)
+            derived = self.derivation("linear", eq, y)
+            if derived:
+                solution, steps = self._with_ics(eq, y, *derived, initial_conditions)
+                return self._ok(solution, "Ecuación Lineal", extra={"steps": steps})
             solution = self._dsolve(eq, y, initial_conditions)
             if isinstance(solution, list):
                 solution = solution[0]
@@ -231,6 +794,10 @@ class ODESolver:
                 eq = Eq(self._parse(lhs), self._parse(rhs))
             else:
                 eq = self._parse(eq_str)
+            derived = self.derivation("bernoulli", eq, y)
+            if derived:
+                solution, steps = self._with_ics(eq, y, *derived, initial_conditions)
+                return self._ok(solution, "Ecuación de Bernoulli", extra={"steps": steps})
             solution = self._dsolve(eq, y, initial_conditions)
             if isinstance(solution, list):
                 solution = solution[0]
@@ -257,18 +824,18 @@ class ODESolver:
 
             try:
                 factor_x = (dM_dy - dN_dx) / N
-                factor_x_simplified = simplify(factor_x)
+                factor_x_simplified = simplify_cached(factor_x)
                 if not factor_x_simplified.has(y):
-                    mu = exp(integrate(factor_x_simplified, x))
+                    mu = exp(integrate_cached(factor_x_simplified, x))
                     return self._ok(mu, "Factor Integrante μ(x)", extra={"type": "mu(x)"})
             except Exception:
                 pass
 
             try:
                 factor_y = (dN_dx - dM_dy) / M
-                factor_y_simplified = simplify(factor_y)
+                factor_y_simplified = simplify_cached(factor_y)
                 if not factor_y_simplified.has(x):
-                    mu = exp(integrate(factor_y_simplified, y))
+                    mu = exp(integrate_cached(factor_y_simplified, y))
                     return self._ok(mu, "Factor Integrante μ(y)", extra={"type": "mu(y)"})
             except Exception:
                 pass
@@ -290,7 +857,8 @@ class ODESolver:
             if special_solution:
                 return special_solution
             solution = self._dsolve(eq, y, initial_conditions)
-            hints = sp.classify_ode(eq, y)
+            with stage("classify"):
+                hints = sp.classify_ode(eq, y)
             return self._ok(solution, "Método General", extra={"hints": hints})
         except Exception as e:
             return self._fail(e, "Método General")
@@ -304,8 +872,9 @@ class ODESolver:
                 eq = Eq(self._parse(lhs), self._parse(rhs))
             else:
                 eq = self._parse(eq_str)
-            solution = dsolve(eq, y, ics=self._prepare_ics(initial_conditions))
-            hints = sp.classify_ode(eq, y)
+            solution = self._dsolve(eq, y, initial_conditions)
+            with stage("classify"):
+                hints = sp.classify_ode(eq, y)
             is_homogeneous = "nth_linear_constant_coeff_homogeneous" in hints
             return self._ok(
                 solution,
@@ -315,6 +884,29 @@ class ODESolver:
         except Exception as e:
             return self._fail(e, "Segundo Orden Coef. Constantes")
 
+    def solve_laplace(self, equation_str, initial_conditions=None):
+        try:
+            y = self.y(self.x)
+            eq_str = self.parse_equation(equation_str)
+            if "=" in eq_str:
+                lhs, rhs = eq_str.split("=")
+                eq = Eq(self._parse(lhs), self._parse(rhs))
+            else:
+                eq = self._parse(eq_str)
+            ics = self._prepare_ics(initial_conditions)
+            if not ics:
+                raise ValueError("La transformada de Laplace requiere condiciones iniciales en un punto x0")
+            with stage("laplace"):
+                solution = self.laplace_ivp(eq, y, ics)
+            if solution is None:
+                raise ValueError(
+                    "La ecuación no es lineal de coeficientes constantes con CI completas, "
+                    "su forzamiento no está en la tabla de transformadas o tiene saltos antes de x0"
+                )
+            return self._ok(solution, "Transformada de Laplace")
+        except Exception as e:
+            return self._fail(e, "Transformada de Laplace")
+
     def solve_reducible_to_first_order(self, equation_str, case_type="general", initial_conditions=None):
         try:
             y = self.y(self.x)
@@ -324,7 +916,7 @@ class ODESolver:
                 eq = Eq(self._parse(lhs), self._parse(rhs))
             else:
                 eq = self._parse(eq_str)
-            solution = dsolve(eq, y, ics=self._prepare_ics(initial_conditions))
+            solution = self._dsolve(eq, y, initial_conditions)
             return self._ok(solution, "Ecuación Reducible a Primer Orden")
         except Exception as e:
             return self._fail(e, "Ecuación Reducible a Primer Orden")
@@ -340,20 +932,23 @@ class ODESolver:
 
     def _solve_case_y_times_ypp_plus_yp_sq(self, eq):
         y = self.y(self.x)
-        expr = sp.simplify(eq.lhs - eq.rhs) if isinstance(eq, sp.Equality) else sp.simplify(eq)
-        target = sp.simplify(sp.diff(y * diff(y, self.x), self.x))
-        if sp.simplify(expr - target) == 0:
+        expr = simplify_cached(eq.lhs - eq.rhs) if isinstance(eq, sp.Equality) else simplify_cached(eq)
+        target = simplify_cached(sp.diff(y * diff(y, self.x), self.x))
+        if simplify_cached(expr - target) == 0:
             solution_eq = Eq(y**2, self.C1 * self.x + self.C2)
             return self._ok(solution_eq, "Caso especial: y*y'' + (y')^2 = 0")
         return None
 
     # ------------------ Helpers de salida ------------------ #
     def _ok(self, solution, method, extra=None):
+        with stage("latex"):
+            solution_latex = self.get_latex_solution(solution)
         return {
             "success": True,
             "solution": str(solution),
             "solution_formatted": self.format_solution(solution),
-            "solution_latex": self.get_latex_solution(solution),
+            "solution_latex": solution_latex,
+            "solution_expr": solution,
             "method": method,
             **(extra or {}),
         }
@@ -0,0 +1,108 @@
+"""
+Medición de complejidad de las ecuaciones antes de resolverlas.
+
+Dos niveles:
+- estimate: estimación léxica del texto, sin SymPy. La usa el router para
+  rechazar entradas absurdas antes de parsearlas y para elegir el carril del
+  pool (normal o pesado, de baja prioridad).
+- measure: medición exacta sobre la ecuación ya parseada (operaciones,
+  profundidad del árbol, orden y no linealidad en y y sus derivadas). Dentro
+  del worker decide la ruta: camino rápido, simbólico normal o respaldo
+  numérico si la ecuación es pesada y hay condiciones iniciales.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from ..config import settings
+
+_OPERATOR = re.compile(r"\*\*|[-+*/^]|[A-Za-z_]\w*\s*\(")
+_PRIMES = re.compile(r"[A-Za-z_]\w*\s*('+)")
+_DERIVATIVE_ORDER = re.compile(r"Derivative\([^,]+\([^)]*\)\s*,\s*x\s*,\s*(\d+)\)")
+
+
+@dataclass
+class Complexity:
+    chars: int
+    ops: int
+    depth: int
+    order: int
+    nonlinear: bool = False
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def estimate(*texts: str) -> Complexity:
+    """Cota léxica: operadores y llamadas, anidamiento de paréntesis y primas."""
+    chars = ops = depth = order = 0
+    for text in texts:
+        chars += len(text)
+        ops += len(_OPERATOR.findall(text))
+        level = 0
+        for char in text:
+            if char in "([":
+                level += 1
+                depth = max(depth, level)
+            elif char in ")]":
+                level -= 1
+        orders = [len(m) for m in _PRIMES.findall(text)] + [int(m) for m in _DERIVATIVE_ORDER.findall(text)]
+        if "dy/dx" in text or "Derivative(" in text:
+            orders.append(1)
+        order = max([order, *orders])
+    return Complexity(chars, ops, depth, order)
+
+
+def _tree_depth(expr) -> int:
+    depth, stack = 0, [(expr, 1)]
+    while stack:
+        node, level = stack.pop()
+        depth = max(depth, level)
+        stack.extend((arg, level + 1) for arg in node.args)
+    return depth
+
+
+def measure(eq, func) -> Complexity:
+    """Complejidad de la ecuación parseada respecto de la incógnita func(x)."""
+    import sympy as sp
+
+    expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+    derivatives = sorted(
+        (d for d in expr.atoms(sp.Derivative) if d.expr == func), key=lambda d: d.derivative_count, reverse=True
+    )
+    order = int(derivatives[0].derivative_count) if derivatives else 0
+    # y, y', y'', ... como símbolos: lineal si el grado total es a lo sumo 1
+    unknowns = [sp.Dummy(f"d{k}") for k in range(len(derivatives) + 1)]
+    replaced = expr.xreplace({d: s for d, s in zip(derivatives, unknowns)}).xreplace({func: unknowns[-1]})
+    if replaced.is_polynomial(*unknowns):
+        nonlinear = sp.Poly(replaced, *unknowns).total_degree() > 1
+    else:
+        nonlinear = True
+    return Complexity(len(str(expr)), int(sp.count_ops(expr)), _tree_depth(expr), order, nonlinear)
+
+
+def rejection(c: Complexity) -> Optional[str]:
+    """Motivo de rechazo si la ecuación excede los límites absolutos; None si es aceptable."""
+    if c.chars > settings.COMPLEXITY_MAX_CHARS:
+        return f"La ecuación es demasiado larga ({c.chars} caracteres; máximo {settings.COMPLEXITY_MAX_CHARS})."
+    if c.ops > settings.COMPLEXITY_MAX_OPS:
+        return f"La ecuación tiene demasiadas operaciones ({c.ops}; máximo {settings.COMPLEXITY_MAX_OPS})."
+    if c.depth > settings.COMPLEXITY_MAX_DEPTH:
+        return f"La ecuación está demasiado anidada (profundidad {c.depth}; máximo {settings.COMPLEXITY_MAX_DEPTH})."
+    if c.order > settings.COMPLEXITY_MAX_ORDER:
+        return f"El orden de la ecuación ({c.order}) supera el máximo permitido ({settings.COMPLEXITY_MAX_ORDER})."
+    return None
+
+
+def is_heavy(c: Complexity) -> bool:
+    """Ecuaciones que se espera que tarden: muchas operaciones, anidamiento o no lineales de orden > 1."""
+    return (
+        c.ops > settings.COMPLEXITY_HEAVY_OPS
+        or c.depth > settings.COMPLEXITY_HEAVY_DEPTH
+        or (c.nonlinear and c.order > 1)
+    )
+
+
+def lane(c: Complexity) -> str:
+    return "heavy" if is_heavy(c) else "normal"
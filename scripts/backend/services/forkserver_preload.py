@@ -0,0 +1,24 @@
+"""
+Módulo que precarga el proceso forkserver (SOLVER_POOL_MODE=process).
+
+El forkserver lo importa una sola vez antes de crear workers: SymPy, NumPy y
+los servicios quedan importados y, si SOLVER_WARMUP está activo, con sus
+cachés pobladas. Cada worker nace con fork() y comparte esas páginas
+copy-on-write en lugar de reimportar todo. gc.freeze() saca esos objetos del
+recolector para que sus pasadas no toquen (y dupliquen) las páginas compartidas.
+"""
+
+import gc
+import logging
+
+from ..config import settings
+from . import solve_service  # noqa: F401  (importa sympy, numpy y los solvers)
+from .worker_pool import warmup_worker
+
+if settings.SOLVER_WARMUP:
+    try:
+        warmup_worker()
+    except Exception:
+        logging.getLogger(__name__).warning("Falló el precalentamiento del forkserver", exc_info=True)
+
+gc.freeze()
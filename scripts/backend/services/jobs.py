@@ -0,0 +1,143 @@
+"""
+Trabajos asíncronos de resolución (API /jobs).
+
+Cada trabajo corre como una tarea del event loop que pasa por el mismo
+planificador y pool que /solve; el cliente recibe un id y consulta estado,
+progreso y resultado sin mantener la conexión abierta. Los trabajos
+terminados se conservan JOBS_TTL segundos en memoria del proceso principal
+(como máximo JOBS_MAX_STORED; si se llena se descartan los terminados más
+viejos).
+
+Cancelar un trabajo en cola lo quita del planificador; si ya corre, se marca
+el control y la integración numérica se detiene en el siguiente chequeo (los
+cálculos simbólicos terminan y su resultado se descarta).
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import settings
+from . import progress
+
+
+class TooManyJobs(Exception):
+    """No hay lugar para otro trabajo (del cliente o en total)."""
+
+
+@dataclass(eq=False)
+class Job:
+    id: str
+    kind: str
+    client: str
+    control: Any
+    steps_requested: Optional[int] = None
+    state: str = "queued"  # queued | done | failed | cancelled ("running" se deriva del control)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def status(self) -> str:
+        if self.state == "queued" and self.control.started_at is not None:
+            return "running"
+        return self.state
+
+    def as_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.control.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.finished_at + settings.JOBS_TTL if self.finished_at else None,
+            "progress": {"steps_completed": self.control.steps, "steps_requested": self.steps_requested},
+            "error": self.error,
+        }
+
+
+class JobStore:
+    def __init__(self, ttl: float, max_stored: int, max_active_per_client: int):
+        self.ttl = ttl
+        self.max_stored = max_stored
+        self.max_active_per_client = max_active_per_client
+        self._jobs: Dict[str, Job] = {}
+
+    def _purge(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+
+    def _make_room(self):
+        self._purge()
+        finished = sorted((j for j in self._jobs.values() if j.finished_at is not None), key=lambda j: j.finished_at)
+        while len(self._jobs) >= self.max_stored and finished:
+            del self._jobs[finished.pop(0).id]
+        if len(self._jobs) >= self.max_stored:
+            raise TooManyJobs(f"Hay demasiados trabajos en curso (máximo {self.max_stored}).")
+
+    def submit(
+        self,
+        kind: str,
+        client: str,
+        run: Callable[[Any], Awaitable[Any]],
+        mode: str = "thread",
+        steps_requested: Optional[int] = None,
+    ) -> Job:
+        """Registra el trabajo y lanza `run(control)` en segundo plano."""
+        active = sum(1 for j in self._jobs.values() if j.client == client and j.finished_at is None)
+        if active >= self.max_active_per_client:
+            raise TooManyJobs(f"Demasiados trabajos activos para este cliente (máximo {self.max_active_per_client}).")
+        self._make_room()
+        job = Job(uuid.uuid4().hex, kind, client, progress.new_control(mode), steps_requested)
+        self._jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, run))
+        return job
+
+    async def _run(self, job: Job, run):
+        try:
+            result = await run(job.control)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e)
+            self._finish(job, "failed", error=str(error))
+        else:
+            self._finish(job, "done", result=result)
+
+    def _finish(self, job: Job, state: str, result=None, error: Optional[str] = None):
+        if job.finished_at is not None:
+            return  # cancelado mientras corría: el resultado se descarta
+        job.state, job.result, job.error = state, result, error
+        job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job: Job) -> Job:
+        """Cancela un trabajo activo; si ya terminó, descarta su resultado."""
+        if job.finished_at is not None:
+            self._jobs.pop(job.id, None)
+            return job
+        job.control.cancelled = True
+        if job.control.started_at is None and job.task is not None:
+            job.task.cancel()
+        self._finish(job, "cancelled", error="Cancelado por el cliente.")
+        return job
+
+    def shutdown(self):
+        for job in self._jobs.values():
+            if job.task is not None and not job.task.done():
+                job.task.cancel()
+        self._jobs.clear()
+        progress.shutdown()
+
+
+store = JobStore(settings.JOBS_TTL, settings.JOBS_MAX_STORED, settings.SCHEDULER_MAX_QUEUED_PER_CLIENT)
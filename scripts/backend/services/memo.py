@@ -0,0 +1,183 @@
+"""
+Memo compartido de integrate/simplify entre peticiones.
+
+Las claves son el srepr canónico de la expresión (los Dummy se renombran en
+orden de aparición, así la misma integral creada con otros Dummy coincide).
+En memoria es un LRU por proceso (SYMBOLIC_MEMO_SIZE); si se configura
+SYMBOLIC_MEMO_PATH los resultados también se guardan en SQLite, compartido
+entre workers y reinicios (hasta SYMBOLIC_MEMO_PERSIST_SIZE filas).
+
+Las filas de SQLite no se evalúan (sympify ejecutaría código del archivo):
+el srepr se recorre como árbol de Python admitiendo solo llamadas a clases de
+SymPy y literales, y se descarta si no reproduce exactamente el mismo srepr.
+"""
+
+import ast
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import sympy as sp
+
+from ..config import settings
+from .metrics import record_cache, stage
+
+logger = logging.getLogger(__name__)
+
+_cache: "OrderedDict[str, sp.Expr]" = OrderedDict()
+_lock = threading.Lock()
+_db: Optional[sqlite3.Connection] = None
+_db_lock = threading.Lock()
+# Si SQLite falla al abrir, el memo sigue solo en memoria (se avisa una vez)
+_disabled = False
+
+
+def _canonical(*exprs):
+    """Reemplaza los Dummy por símbolos fijos; devuelve (expresiones, mapa inverso)."""
+    dummies = []
+    for expr in exprs:
+        for atom in sp.preorder_traversal(expr):
+            if isinstance(atom, sp.Dummy) and atom not in dummies:
+                dummies.append(atom)
+    forward = {d: sp.Symbol(f"_memo{i}", **d.assumptions0) for i, d in enumerate(dummies)}
+    back = {v: k for k, v in forward.items()}
+    return [expr.xreplace(forward) for expr in exprs], back
+
+
+# Únicas clases que reciben strings (nombres y dígitos); el resto de los
+# constructores de SymPy pueden pasar sus argumentos por sympify
+_STRING_ARGS = {"Symbol", "Dummy", "Function", "Float", "Wild", "WildFunction"}
+# Clases que aparecen en srepr sin estar exportadas en el espacio de nombres de sympy
+_EXTRA_NAMES = {"ExprCondPair": sp.functions.elementary.piecewise.ExprCondPair}
+
+
+class _UnsafeRow(ValueError):
+    """La fila no es un srepr que este módulo haya podido generar."""
+
+
+def _build(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (bool, int, float)):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_build(node.operand)
+    if isinstance(node, ast.Name):
+        value = _EXTRA_NAMES.get(node.id) or getattr(sp, node.id, None)
+        if isinstance(value, sp.Basic) or (isinstance(value, type) and issubclass(value, sp.Basic)):
+            return value
+        raise _UnsafeRow(node.id)
+    if isinstance(node, ast.Call):
+        func = _build(node.func)
+        if not (isinstance(func, type) and issubclass(func, sp.Basic)):
+            raise _UnsafeRow(ast.dump(node.func))
+        strings = getattr(node.func, "id", None) in _STRING_ARGS
+        args = [_build_arg(arg, strings) for arg in node.args]
+        kwargs = {kw.arg: _build_arg(kw.value, False) for kw in node.keywords if kw.arg is not None}
+        if len(kwargs) != len(node.keywords):
+            raise _UnsafeRow("**kwargs")
+        return func(*args, **kwargs)
+    raise _UnsafeRow(type(node).__name__)
+
+
+def _build_arg(node, strings: bool):
+    if strings and isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return _build(node)
+
+
+def _parse_srepr(text: str):
+    """Reconstruye un srepr sin evaluarlo; None si la fila no es confiable."""
+    try:
+        value = _build(ast.parse(text, mode="eval").body)
+        if sp.srepr(value) == text:
+            return value
+    except (_UnsafeRow, SyntaxError, TypeError, ValueError, RecursionError):
+        pass
+    logger.warning("Fila del memo persistente descartada (no es un srepr válido)")
+    return None
+
+
+def _connection() -> Optional[sqlite3.Connection]:
+    global _db, _disabled
+    if not settings.SYMBOLIC_MEMO_PATH or _disabled:
+        return None
+    if _db is None:
+        with _db_lock:
+            if _db is None and not _disabled:
+                try:
+                    db = sqlite3.connect(settings.SYMBOLIC_MEMO_PATH, check_same_thread=False, timeout=5)
+                    db.execute("CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, value TEXT)")
+                    db.commit()
+                    _db = db
+                except sqlite3.Error:
+                    logger.warning("No se pudo abrir el memo persistente %s", settings.SYMBOLIC_MEMO_PATH, exc_info=True)
+                    _disabled = True
+    return _db
+
+
+def _load(key: str):
+    db = _connection()
+    if db is None:
+        return None
+    try:
+        with _db_lock:
+            row = db.execute("SELECT value FROM memo WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return _parse_srepr(row[0]) if row else None
+
+
+def _store(key: str, value) -> None:
+    db = _connection()
+    if db is None:
+        return
+    try:
+        with _db_lock:
+            cursor = db.execute("INSERT OR REPLACE INTO memo (key, value) VALUES (?, ?)", (key, sp.srepr(value)))
+            if cursor.lastrowid % 256 == 0:
+                db.execute(
+                    "DELETE FROM memo WHERE rowid <= (SELECT MAX(rowid) FROM memo) - ?",
+                    (settings.SYMBOLIC_MEMO_PERSIST_SIZE,),
+                )
+            db.commit()
+    except sqlite3.Error:
+        logger.warning("No se pudo escribir en el memo persistente", exc_info=True)
+
+
+def _memoized(kind: str, exprs, compute):
+    canonical, back = _canonical(*exprs)
+    key = kind + ":" + sp.srepr(tuple(canonical))
+    with _lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+    if value is None:
+        value = _load(key)
+        record_cache(kind, value is not None)
+        if value is None:
+            with stage(kind):
+                value = compute(*canonical)
+            _store(key, value)
+        with _lock:
+            _cache[key] = value
+            while len(_cache) > settings.SYMBOLIC_MEMO_SIZE:
+                _cache.popitem(last=False)
+    else:
+        record_cache(kind, True)
+    return value.xreplace(back) if back else value
+
+
+def integrate_cached(expr, var):
+    """integrate(expr, var) memorizado por srepr canónico."""
+    return _memoized("integrate", (sp.sympify(expr), var), sp.integrate)
+
+
+def simplify_cached(expr):
+    """simplify(expr) memorizado por srepr canónico."""
+    return _memoized("simplify", (sp.sympify(expr),), sp.simplify)
+
+
+def clear() -> None:
+    with _lock:
+        _cache.clear()
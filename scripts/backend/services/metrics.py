@@ -0,0 +1,257 @@
+"""
+Instrumentación ligera: histogramas de tiempo por etapa, contadores y gauges en
+memoria, exportados en formato de texto de Prometheus por /metrics.
+
+Las etapas se miden con `stage("dsolve")`. Si hay una petición en curso
+(`begin_request`), los tiempos también se acumulan para el header Server-Timing.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = self._key(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = self._key(labels)
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def add_gauge(self, name: str, amount: float, **labels):
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            key = self._key(labels)
+            series[key] = series.get(key, 0.0) + amount
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """Registra una función que produce gauges calculados al momento de exportar."""
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                for key, hist in series.items():
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        lines.append(f"{name}_bucket{_fmt_labels(key + (('le', _fmt_value(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_fmt_labels(key + (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{name}_sum{_fmt_labels(key)} {_fmt_value(hist.total)}")
+                    lines.append(f"{name}_count{_fmt_labels(key)} {hist.count}")
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    gauges.setdefault(name, {})[self._key(labels)] = value
+            except Exception:
+                continue
+        for name, series in sorted(gauges.items()):
+            self._header(lines, name, "gauge")
+            for key, value in series.items():
+                lines.append(f"{name}{_fmt_labels(key)} {_fmt_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str):
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+registry = MetricsRegistry()
+registry.describe("solver_stage_seconds", "Duración de cada etapa del pipeline de resolución.")
+registry.describe("solver_requests_total", "Peticiones por endpoint, método, tipo y resultado.")
+registry.describe("solver_cache_requests_total", "Consultas a cachés por caché y resultado (hit/miss).")
+registry.describe("solver_inflight_requests", "Peticiones de resolución en curso.")
+registry.describe("solver_pool_queue_depth", "Trabajos esperando cupo en el planificador (todos los carriles).")
+registry.describe("solver_pool_busy_workers", "Workers del pool ocupados resolviendo.")
+registry.describe("solver_pool_heavy_inflight", "Trabajos en el carril pesado (en curso o en espera).")
+registry.describe("solver_routing_total", "Peticiones por carril y ruta elegidos por el análisis de complejidad.")
+registry.describe("solver_scheduler_queued", "Trabajos esperando cupo en el planificador por carril y prioridad.")
+registry.describe("solver_scheduler_wait_seconds", "Espera en la cola del planificador por carril y prioridad.")
+registry.describe("solver_scheduler_rejected_total", "Trabajos rechazados por exceder la cola por cliente.")
+registry.describe("sympy_cache_hits", "Aciertos acumulados en las cachés internas de SymPy.")
+registry.describe("sympy_cache_misses", "Fallos acumulados en las cachés internas de SymPy.")
+
+
+# --- Tiempos por petición (Server-Timing) ---
+
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+# En los workers las etapas solo se acumulan; el proceso principal las registra con replay_stages
+_deferred_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("deferred_timings", default=None)
+
+
+def begin_request() -> List[Tuple[str, float]]:
+    """Activa la recolección de tiempos para la petición actual y devuelve la lista."""
+    timings: List[Tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[List[Tuple[str, float]]]:
+    return _request_timings.get()
+
+
+def record_stage(name: str, seconds: float):
+    deferred = _deferred_timings.get()
+    if deferred is not None:
+        deferred.append((name, seconds))
+        return
+    registry.observe("solver_stage_seconds", seconds, stage=name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, seconds))
+
+
+@contextmanager
+def collect_stages():
+    """Acumula las etapas del bloque sin registrarlas (útil dentro de un worker)."""
+    timings: List[Tuple[str, float]] = []
+    token = _deferred_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _deferred_timings.reset(token)
+
+
+def replay_stages(timings: List[Tuple[str, float]], observe: bool = True):
+    """Registra etapas medidas en otro contexto; con observe=False solo van al Server-Timing de la petición."""
+    if observe:
+        for name, seconds in timings:
+            record_stage(name, seconds)
+        return
+    current = _request_timings.get()
+    if current is not None:
+        current.extend(timings)
+
+
+@contextmanager
+def stage(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool):
+    registry.inc("solver_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+
+def count_request(endpoint: str, method: str, equation_type: Optional[str], status: str):
+    registry.inc(
+        "solver_requests_total",
+        endpoint=endpoint,
+        method=method,
+        equation_type=equation_type or "auto",
+        status=status,
+    )
+
+
+@contextmanager
+def track_request(endpoint: str, method: str, equation_type: Optional[str] = None):
+    """Mantiene el gauge de peticiones en curso y cuenta el resultado por método."""
+    registry.add_gauge("solver_inflight_requests", 1, endpoint=endpoint)
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        registry.add_gauge("solver_inflight_requests", -1, endpoint=endpoint)
+        count_request(endpoint, method, equation_type, status)
+
+
+def server_timing_header(timings: List[Tuple[str, float]]) -> str:
+    """Agrega los tiempos por etapa (una etapa puede repetirse) al formato Server-Timing."""
+    totals: Dict[str, float] = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in totals.items())
+
+
+def _sympy_cache_collector():
+    from sympy.core.cache import CACHE
+
+    hits = misses = 0
+    for func in CACHE:
+        info = func.cache_info()
+        hits += info.hits
+        misses += info.misses
+    return [("sympy_cache_hits", {}, hits), ("sympy_cache_misses", {}, misses)]
+
+
+registry.register_collector(_sympy_cache_collector)
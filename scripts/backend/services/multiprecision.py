@@ -0,0 +1,193 @@
+"""
+Integración numérica en precisión múltiple (mpmath) con escalado automático.
+
+Modo `auto`: se integra en float64 y se hace un chequeo de consistencia barato:
+- una segunda corrida float64 con el estado inicial perturbado; el cociente
+  entre la desviación y la perturbación estima cuánto amplifica el problema los
+  errores de redondeo (error estimado = amplificación * eps * pasos);
+- el lado derecho se reevalúa en mpmath en unos pocos puntos de la trayectoria
+  para detectar cancelación catastrófica en la propia f.
+Si alguno supera MP_CONSISTENCY_TOLERANCE, o la corrida float64 produjo NaN/Inf,
+se reintegra con mpmath duplicando los dígitos hasta que dos precisiones
+seguidas coincidan.
+
+Modo `mpmath`: se integra directamente con los dígitos pedidos.
+
+La precisión solo corrige errores de redondeo; el error de truncamiento del
+método depende del paso (ver accuracy).
+
+Cada corrida usa su propio mpmath.MPContext: el contexto global mpmath.mp es
+compartido por los hilos del pool y cambiar su precisión en uno alteraría las
+corridas concurrentes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import mpmath
+import numpy as np
+
+from ..config import settings
+from .metrics import stage
+from .numeric_solver import IntegrationResult, integrate
+
+# build(modules) -> (f, funciones de evento) compiladas para "numpy" o para los módulos de un contexto
+Builder = Callable[[Any], Tuple[Callable, List[Callable]]]
+
+
+@dataclass
+class PrecisionRun:
+    result: IntegrationResult
+    # En mpmath, f queda ligada al contexto de la corrida y conserva su precisión
+    f: Callable
+    # None = float64
+    dps: Optional[int] = None
+    info: Dict = field(default_factory=dict)
+
+
+def context(dps: int) -> mpmath.MPContext:
+    """Contexto de mpmath propio con `dps` dígitos (no toca mpmath.mp)."""
+    ctx = mpmath.MPContext()
+    ctx.dps = dps
+    return ctx
+
+
+def lambdify_modules(ctx: mpmath.MPContext) -> list:
+    """Módulos para lambdify con los nombres de mpmath (mpf, sin, pi, ...) resueltos en `ctx`."""
+    namespace = {name: getattr(ctx, name) for name in dir(mpmath) if not name.startswith("_") and hasattr(ctx, name)}
+    return [namespace, "mpmath"]
+
+
+def _regular_steps(res: IntegrationResult) -> int:
+    # Con stop_on_event el último punto es el evento, fuera de la malla regular
+    return len(res.xs) - 1 - (1 if res.status == "event" else 0)
+
+
+def _as_rows(ys, m: int) -> np.ndarray:
+    return np.asarray(ys[: m + 1], dtype=float).reshape(m + 1, -1)
+
+
+def _rhs_error(f, f_mp, ctx: mpmath.MPContext, res: IntegrationResult) -> float:
+    """Máximo error relativo de f en float64 frente a f_mp (compilada en ctx) sobre puntos de la trayectoria."""
+    idx = np.unique(np.linspace(0, len(res.xs) - 1, settings.MP_CHECK_POINTS).astype(int))
+    worst = 0.0
+    for i in idx:
+        xv, yv = res.xs[i], np.atleast_1d(np.asarray(res.ys[i], dtype=float))
+        with np.errstate(all="ignore"):
+            approx = np.atleast_1d(np.asarray(f(xv, yv), dtype=float))
+        exact = f_mp(ctx.mpf(float(xv)), np.array([ctx.mpf(float(v)) for v in yv], dtype=object))
+        for a, b in zip(approx, np.atleast_1d(exact)):
+            if not np.isfinite(a):
+                return float("inf")
+            worst = max(worst, float(abs(ctx.mpf(float(a)) - b) / max(1, abs(b))))
+    return worst
+
+
+def consistency_check(
+    step, f, x0: float, y0, h: float, res: IntegrationResult, f_mp=None, ctx: Optional[mpmath.MPContext] = None
+) -> Dict:
+    """Estima el error de redondeo de una corrida float64 (perturbación inicial y f en mpmath)."""
+    n = _regular_steps(res)
+    y0_arr = np.asarray(y0, dtype=float)
+    delta = settings.MP_PERTURBATION * max(1.0, float(np.max(np.abs(y0_arr))))
+    perturbed = integrate(step, f, x0, y0_arr + delta, h, n)
+    m = min(n, len(perturbed.xs) - 1)
+    base, other = _as_rows(res.ys, m), _as_rows(perturbed.ys, m)
+    with np.errstate(all="ignore"):
+        deviation = np.max(np.abs(base - other))
+        amplification = float(deviation / delta) if np.isfinite(deviation) else float("inf")
+        scale = max(1.0, float(np.max(np.abs(base)))) if np.all(np.isfinite(base)) else 1.0
+    estimated = amplification * np.finfo(float).eps * max(n, 1) / scale
+    rhs_error = _rhs_error(f, f_mp, ctx or context(settings.MP_DPS), res) if f_mp is not None else 0.0
+    ok = (
+        res.status != "nonfinite"
+        and perturbed.status != "nonfinite"
+        and estimated <= settings.MP_CONSISTENCY_TOLERANCE
+        and rhs_error <= settings.MP_CONSISTENCY_TOLERANCE
+    )
+    return {
+        "amplification": amplification,
+        "estimated_rounding_error": float(estimated),
+        "rhs_error": rhs_error,
+        "ok": bool(ok),
+    }
+
+
+def _mp_run(step, build: Builder, x0, y0, h, n, dps, stop_on_event) -> Tuple[IntegrationResult, Callable]:
+    ctx = context(dps)
+    f, events = build(lambdify_modules(ctx))
+    y0_mp = np.array([ctx.mpf(float(v)) for v in np.atleast_1d(y0)], dtype=object)
+    res = integrate(
+        step,
+        f,
+        ctx.mpf(float(x0)),
+        y0_mp,
+        ctx.mpf(float(h)),
+        n,
+        events=events,
+        stop_on_event=stop_on_event,
+    )
+    return res, f
+
+
+def _disagreement(a: IntegrationResult, b: IntegrationResult) -> float:
+    m = min(len(a.xs), len(b.xs)) - 1
+    # Cada corrida tiene su contexto: se comparan convertidas a uno de precisión máxima
+    ctx = context(settings.MP_MAX_DPS)
+    worst = ctx.mpf(0)
+    for ya, yb in zip(a.ys[: m + 1], b.ys[: m + 1]):
+        for va, vb in zip(np.atleast_1d(ya), np.atleast_1d(yb)):
+            va, vb = ctx.mpf(va), ctx.mpf(vb)
+            worst = max(worst, abs(va - vb) / max(1, abs(vb)))
+    return float(worst)
+
+
+def _escalate(step, build: Builder, x0, y0, h, n, start_dps, stop_on_event) -> PrecisionRun:
+    dps = start_dps
+    res, f = _mp_run(step, build, x0, y0, h, n, dps, stop_on_event)
+    history = [dps]
+    while True:
+        next_dps = min(2 * dps, settings.MP_MAX_DPS)
+        if next_dps == dps:
+            return PrecisionRun(res, f, dps, {"converged": False, "dps_tried": history})
+        res_next, f_next = _mp_run(step, build, x0, y0, h, n, next_dps, stop_on_event)
+        history.append(next_dps)
+        diff = _disagreement(res, res_next)
+        if diff <= settings.MP_TOLERANCE:
+            info = {"converged": True, "dps_tried": history, "disagreement": diff}
+            return PrecisionRun(res_next, f_next, next_dps, info)
+        res, f, dps = res_next, f_next, next_dps
+
+
+def integrate_with_precision(
+    step,
+    build: Builder,
+    x0: float,
+    y0,
+    h: float,
+    n: int,
+    mode: str,
+    dps: Optional[int] = None,
+    stop_on_event: bool = False,
+) -> PrecisionRun:
+    """Integra en float64, en mpmath o en float64 con escalado automático (`auto`)."""
+    if mode == "mpmath":
+        dps = dps or settings.MP_DPS
+        with stage("mpmath"):
+            res, f = _mp_run(step, build, x0, y0, h, n, dps, stop_on_event)
+        return PrecisionRun(res, f, dps, {"mode": "mpmath", "dps": dps})
+
+    f, events = build("numpy")
+    res = integrate(step, f, x0, y0, h, n, events=events, stop_on_event=stop_on_event)
+    if mode != "auto":
+        return PrecisionRun(res, f, None, {"mode": "float64"})
+
+    ctx = context(settings.MP_DPS)
+    f_mp, _ = build(lambdify_modules(ctx))
+    check = consistency_check(step, f, x0, y0, h, res, f_mp, ctx)
+    if check["ok"]:
+        return PrecisionRun(res, f, None, {"mode": "float64", "escalated": False, **check})
+    with stage("mpmath"):
+        run = _escalate(step, build, x0, y0, h, n, dps or settings.MP_DPS, stop_on_event)
+    run.info = {"mode": "mpmath", "escalated": True, "dps": run.dps, **check, **run.info}
+    return run
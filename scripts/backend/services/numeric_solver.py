@@ -1,14 +1,23 @@
-from typing import Callable, List, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
-from sympy import Derivative, Eq, Function, symbols, solve
+from sympy import Derivative, Dummy, Eq, Function, symbols, solve
 from sympy.utilities.lambdify import lambdify
 
+from ..config import settings
+from . import progress
+from .metrics import stage
+
 x = symbols("x")
 
 
-def build_rhs_scalar(eq: Eq, func: Function) -> Callable[[float, float], float]:
-    """Obtiene f(x, y) de una ecuación Derivative(y,x) = rhs."""
+def build_rhs_scalar(eq: Eq, func: Function, vectorized: bool = False) -> Callable[[float, float], float]:
+    """Obtiene f(x, y) de una ecuación Derivative(y,x) = rhs.
+
+    Con `vectorized` devuelve la función NumPy sin envolver, para evaluarla
+    sobre arreglos completos (mallas del campo de direcciones).
+    """
     if not isinstance(eq, Eq):
         raise ValueError("La ecuación debe ser una igualdad para método numérico.")
 
@@ -20,81 +29,338 @@ def build_rhs_scalar(eq: Eq, func: Function) -> Callable[[float, float], float]:
         rhs_candidate = solve(eq, target)
         if rhs_candidate:
             rhs = rhs_candidate[0]
-    f = lambdify((x, func(x)), rhs, modules="numpy")
+    with stage("lambdify"):
+        f = lambdify((x, func(x)), rhs, modules="numpy")
+    if vectorized:
+        return f
     return lambda xv, yv: float(f(xv, yv))
 
 
-def euler(f: Callable[[float, float], float], x0: float, y0: float, h: float, n: int):
-    xs = [x0]
-    ys = [y0]
+def build_event_functions(
+    exprs: Sequence, func: Function, index: Optional[int] = None, modules="numpy"
+) -> List[Callable[[float, float], float]]:
+    """Compila funciones de evento g(x, y); el evento ocurre cuando g cruza cero.
+
+    Con `index` el estado es un vector y g se evalúa sobre esa componente.
+    """
+    events = []
+    for expr in exprs:
+        g = lambdify((x, func(x)), expr, modules=modules)
+        if index is None:
+            events.append(lambda xv, yv, g=g: float(g(xv, yv)))
+        else:
+            events.append(lambda xv, yv, g=g: float(g(xv, yv[index])))
+    return events
+
+
+# --- Pasos individuales (sirven para escalares y vectores numpy) ---
+
+
+def euler_step(f, xv, yv, h):
+    return yv + h * f(xv, yv)
+
+
+def rk4_step(f, xv, yv, h):
+    k1 = f(xv, yv)
+    k2 = f(xv + h / 2, yv + h * k1 / 2)
+    k3 = f(xv + h / 2, yv + h * k2 / 2)
+    k4 = f(xv + h, yv + h * k3)
+    return yv + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+# --- Integradores simplécticos ---
+# Para sistemas de segundo orden separables q'' = a(x, q): el estado alterna
+# posición y velocidad por variable (q1, p1, q2, p2, ...), tal como lo arma
+# reduce_to_first_order, y la aceleración se lee de f(x, estado)[1::2].
+
+
+def _accel(f, xv, q, p):
+    return np.asarray(f(xv, _pack(q, p)))[1::2]
+
+
+def _pack(q, p):
+    # dtype object conserva los mpf en el modo de precisión múltiple
+    state = np.empty(2 * q.size, dtype=np.result_type(q, p))
+    state[0::2], state[1::2] = q, p
+    return state
+
+
+def verlet_step(f, xv, yv, h):
+    """Velocity Verlet (kick-drift-kick), orden 2."""
+    q, p = yv[0::2], yv[1::2]
+    p_half = p + h / 2 * _accel(f, xv, q, p)
+    q_new = q + h * p_half
+    p_new = p_half + h / 2 * _accel(f, xv + h, q_new, p_half)
+    return _pack(q_new, p_new)
+
+
+def leapfrog_step(f, xv, yv, h):
+    """Leapfrog drift-kick-drift, orden 2."""
+    q, p = yv[0::2], yv[1::2]
+    q_half = q + h / 2 * p
+    p_new = p + h * _accel(f, xv + h / 2, q_half, p)
+    return _pack(q_half + h / 2 * p_new, p_new)
+
+
+_CBRT2 = 2 ** (1 / 3)
+_W1 = 1 / (2 - _CBRT2)
+_W0 = -_CBRT2 / (2 - _CBRT2)
+YOSHIDA_C = (_W1 / 2, (_W0 + _W1) / 2, (_W0 + _W1) / 2, _W1 / 2)
+YOSHIDA_D = (_W1, _W0, _W1)
+
+
+def yoshida4_step(f, xv, yv, h):
+    """Composición de Yoshida de orden 4 (tres leapfrogs con pesos w1, w0, w1)."""
+    q, p = yv[0::2].copy(), yv[1::2].copy()
+    xq = xv
+    for c, d in zip(YOSHIDA_C, YOSHIDA_D):
+        q = q + c * h * p
+        xq = xq + c * h
+        p = p + d * h * _accel(f, xq, q, p)
+    q = q + YOSHIDA_C[-1] * h * p
+    return _pack(q, p)
+
+
+STEPPERS = {
+    "euler": euler_step,
+    "rk4": rk4_step,
+    "verlet": verlet_step,
+    "leapfrog": leapfrog_step,
+    "yoshida4": yoshida4_step,
+}
+SYMPLECTIC = ("verlet", "leapfrog", "yoshida4")
+
+
+def stepper(method: str):
+    """Función de paso para un método 'numeric:<nombre>'."""
+    return STEPPERS[method.split(":")[-1]]
+
+
+def is_symplectic(method: str) -> bool:
+    return method.split(":")[-1] in SYMPLECTIC
+
+
+# --- Integración con eventos y terminación temprana ---
+
+
+@dataclass
+class IntegrationResult:
+    xs: List[float]
+    ys: List
+    events: List[Dict[str, float]] = field(default_factory=list)
+    # completed | event | overflow | nonfinite
+    status: str = "completed"
+
+
+def _is_blowup(yv) -> Optional[str]:
+    arr = np.asarray(yv, dtype=float)
+    if not np.all(np.isfinite(arr)):
+        return "nonfinite"
+    if np.any(np.abs(arr) > settings.NUMERIC_OVERFLOW_LIMIT):
+        return "overflow"
+    return None
+
+
+def _locate_event(step, f, g, xa, ya, ga, h, gb):
+    """Ubica la raíz de g entre dos pasos con regula falsi (Illinois).
+
+    Los estados intermedios se obtienen con un subpaso del mismo método desde
+    (xa, ya), así la raíz conserva el orden de precisión del integrador.
+    """
+    lo, hi = 0.0, h
+    g_lo, g_hi = ga, gb
+    theta, y_theta = hi, None
+    side = 0
+    for _ in range(settings.EVENT_MAX_ITER):
+        theta = (lo * g_hi - hi * g_lo) / (g_hi - g_lo) if g_hi != g_lo else (lo + hi) / 2
+        y_theta = step(f, xa, ya, theta)
+        g_theta = g(xa + theta, y_theta)
+        if g_theta == 0 or abs(hi - lo) <= settings.EVENT_TOLERANCE * max(1.0, abs(xa)):
+            break
+        if (g_theta > 0) == (g_lo > 0):
+            lo, g_lo = theta, g_theta
+            if side == -1:
+                g_hi /= 2
+            side = -1
+        else:
+            hi, g_hi = theta, g_theta
+            if side == 1:
+                g_lo /= 2
+            side = 1
+    return xa + theta, y_theta
+
+
+def integrate(
+    step,
+    f,
+    x0: float,
+    y0,
+    h: float,
+    n: int,
+    events: Optional[Sequence[Callable]] = None,
+    stop_on_event: bool = False,
+) -> IntegrationResult:
+    """Itera `step` n veces detectando eventos y abortando ante NaN/Inf o desborde."""
+    with stage("integrate"):
+        return _integrate(step, f, x0, y0, h, n, events or [], stop_on_event)
+
+
+def _integrate(step, f, x0, y0, h, n, events, stop_on_event) -> IntegrationResult:
+    xv, yv = x0, y0
+    result = IntegrationResult(xs=[xv], ys=[yv])
+    g_prev = [g(xv, yv) for g in events]
     for _ in range(n):
-        y0 = y0 + h * f(x0, y0)
-        x0 = x0 + h
-        xs.append(x0)
-        ys.append(y0)
-    return xs, ys
+        try:
+            with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+                y_new = step(f, xv, yv, h)
+        except (OverflowError, ZeroDivisionError, FloatingPointError):
+            result.status = "overflow"
+            break
+        reason = _is_blowup(y_new)
+        if reason:
+            result.status = reason
+            break
+        x_new = xv + h
+        g_new = [g(x_new, y_new) for g in events]
+        hit = None
+        for idx, (g, ga, gb) in enumerate(zip(events, g_prev, g_new)):
+            if ga != 0 and (gb == 0 or (ga > 0) != (gb > 0)):
+                xe, ye = _locate_event(step, f, g, xv, yv, ga, h, gb)
+                result.events.append({"event": idx, "x": float(xe), "y": ye})
+                if hit is None or xe < hit[0]:
+                    hit = (xe, ye)
+        if stop_on_event and hit is not None:
+            result.xs.append(hit[0])
+            result.ys.append(hit[1])
+            result.status = "event"
+            break
+        xv, yv, g_prev = x_new, y_new, g_new
+        result.xs.append(xv)
+        result.ys.append(yv)
+        if len(result.xs) % progress.EVERY == 1:
+            progress.advance(progress.EVERY)
+    progress.advance((len(result.xs) - 1) % progress.EVERY)
+    return result
+
+
+def euler(f: Callable[[float, float], float], x0: float, y0: float, h: float, n: int):
+    res = integrate(euler_step, f, x0, y0, h, n)
+    return res.xs, res.ys
 
 
 def rk4(f: Callable[[float, float], float], x0: float, y0: float, h: float, n: int):
-    xs = [x0]
-    ys = [y0]
-    for _ in range(n):
-        k1 = f(x0, y0)
-        k2 = f(x0 + h / 2, y0 + h * k1 / 2)
-        k3 = f(x0 + h / 2, y0 + h * k2 / 2)
-        k4 = f(x0 + h, y0 + h * k3)
-        y0 = y0 + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
-        x0 = x0 + h
-        xs.append(x0)
-        ys.append(y0)
-    return xs, ys
+    res = integrate(rk4_step, f, x0, y0, h, n)
+    return res.xs, res.ys
 
 
 # --- Sistemas ---
 
 
-def build_rhs_system(eqs: Sequence[Eq], funcs: Sequence[Function]):
-    rhs_funcs = []
-    for eq, func in zip(eqs, funcs):
-        target = Derivative(func(x), x)
-        rhs = eq.rhs
-        if eq.lhs != target:
-            rhs_candidate = solve(eq, target)
-            if rhs_candidate:
-                rhs = rhs_candidate[0]
-        rhs_funcs.append(rhs)
-    lambda_rhs = lambdify(
-        (x, *[f(x) for f in funcs]), rhs_funcs, modules="numpy"
-    )
+def derivative_order(expr, func) -> int:
+    """Mayor orden de derivada de func(x) que aparece en expr."""
+    return max((d.derivative_count for d in expr.atoms(Derivative) if d.expr == func), default=0)
+
+
+@dataclass
+class FirstOrderSystem:
+    """Sistema de primer orden y' = f(x, estado) obtenido por reducción."""
+
+    f: Callable
+    # (función, orden de derivada) de cada componente del estado
+    layout: List[Tuple[str, int]]
+    # Segundo orden con aceleración independiente de las velocidades (admite simplécticos)
+    separable_second_order: bool = False
+    # Expresiones del lado derecho y argumentos (x, estado...), para recompilar con otro backend
+    rhs: List = field(default_factory=list)
+    args: Tuple = ()
+
+    @property
+    def dim(self) -> int:
+        return len(self.layout)
+
+    def labels(self) -> List[str]:
+        return [name + "'" * k for name, k in self.layout]
+
+    def compile(self, modules="numpy") -> Callable:
+        """f(x, estado) evaluada con numpy (float64) o con los módulos de un contexto mpmath (su precisión)."""
+        return _compile_system(self.args, self.rhs, modules)
+
+
+def _compile_system(args, rhs, modules) -> Callable:
+    with stage("lambdify"):
+        lambda_rhs = lambdify(args, rhs, modules=modules)
+    dtype = float if modules == "numpy" else object
+
     def f_system(xv, y_vec):
-        args = [xv, *list(y_vec)]
-        vals = lambda_rhs(*args)
-        return np.array(vals, dtype=float)
+        return np.array(lambda_rhs(xv, *y_vec), dtype=dtype)
+
     return f_system
 
 
+def _highest_derivatives(eqs: Sequence[Eq], targets: Sequence) -> List:
+    """Despeja las derivadas de mayor orden; evita solve si ya vienen despejadas."""
+    direct = {}
+    for eq in eqs:
+        if isinstance(eq, Eq) and eq.lhs in targets and not any(eq.rhs.has(t) for t in targets):
+            direct[eq.lhs] = eq.rhs
+    if len(direct) == len(targets):
+        return [direct[t] for t in targets]
+    solved = solve(list(eqs), list(targets), dict=True)
+    if not solved or any(t not in solved[0] for t in targets):
+        raise ValueError("No se pudieron despejar las derivadas de mayor orden para el método numérico.")
+    return [solved[0][t] for t in targets]
+
+
+def reduce_to_first_order(eqs: Sequence[Eq], funcs: Sequence[Function]) -> FirstOrderSystem:
+    """Reduce una EDO de orden n o un sistema de orden mixto a un sistema de primer orden.
+
+    Cada función de orden k aporta k componentes al estado (f, f', ..., f^(k-1));
+    la derivada de la última se obtiene despejando f^(k) de las ecuaciones.
+    """
+    if len(eqs) != len(funcs):
+        raise ValueError("El sistema debe tener tantas ecuaciones como funciones incógnita.")
+    orders = [max(derivative_order(eq, fn(x)) for eq in eqs) for fn in funcs]
+    if any(k == 0 for k in orders):
+        raise ValueError("Cada función incógnita debe aparecer derivada al menos una vez.")
+    targets = [Derivative(fn(x), (x, k)) for fn, k in zip(funcs, orders)]
+    highest = _highest_derivatives(eqs, targets)
+
+    layout, state, replacements = [], [], []
+    for fn, k in zip(funcs, orders):
+        for j in range(k):
+            sym = Dummy(f"{fn.__name__}_{j}")
+            layout.append((fn.__name__, j))
+            state.append(sym)
+            replacements.append((j, Derivative(fn(x), (x, j)) if j else fn(x), sym))
+    # Sustituir primero las derivadas de mayor orden para no romperlas al reemplazar f(x)
+    ordered = [(expr, sym) for _, expr, sym in sorted(replacements, key=lambda t: -t[0])]
+
+    rhs, pos = [], 0
+    for k, top in zip(orders, highest):
+        rhs.extend(state[pos + 1 : pos + k])
+        rhs.append(top.subs(ordered))
+        pos += k
+    velocities = state[1::2]
+    separable = all(k == 2 for k in orders) and not any(expr.has(*velocities) for expr in rhs[1::2])
+    args = (x, *state)
+    return FirstOrderSystem(
+        f=_compile_system(args, rhs, "numpy"),
+        layout=layout,
+        separable_second_order=separable,
+        rhs=rhs,
+        args=args,
+    )
+
+
+def build_rhs_system(eqs: Sequence[Eq], funcs: Sequence[Function]):
+    return reduce_to_first_order(eqs, funcs).f
+
+
 def euler_system(f_system, x0: float, y0: List[float], h: float, n: int):
-    xs = [x0]
-    ys = [np.array(y0, dtype=float)]
-    for _ in range(n):
-        y_new = ys[-1] + h * f_system(x0, ys[-1])
-        x0 = x0 + h
-        xs.append(x0)
-        ys.append(y_new)
-    return xs, ys
+    res = integrate(euler_step, f_system, x0, np.array(y0, dtype=float), h, n)
+    return res.xs, res.ys
 
 
 def rk4_system(f_system, x0: float, y0: List[float], h: float, n: int):
-    xs = [x0]
-    ys = [np.array(y0, dtype=float)]
-    for _ in range(n):
-        y_curr = ys[-1]
-        k1 = f_system(x0, y_curr)
-        k2 = f_system(x0 + h / 2, y_curr + h * k1 / 2)
-        k3 = f_system(x0 + h / 2, y_curr + h * k2 / 2)
-        k4 = f_system(x0 + h, y_curr + h * k3)
-        y_new = y_curr + (h / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
-        x0 = x0 + h
-        xs.append(x0)
-        ys.append(y_new)
-    return xs, ys
+    res = integrate(rk4_step, f_system, x0, np.array(y0, dtype=float), h, n)
+    return res.xs, res.ys
@@ -1,5 +1,5 @@
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from sympy import (
     Derivative,
@@ -20,6 +20,8 @@ from sympy import (
     sinh,
     cosh,
     tanh,
+    Heaviside,
+    DiracDelta,
     pi,
     E,
 )
@@ -50,6 +52,9 @@ ALLOWED_FUNCTIONS = {
     "sinh": sinh,
     "cosh": cosh,
     "tanh": tanh,
+    # Forzamientos escalón/impulso (PVI por transformada de Laplace)
+    "Heaviside": Heaviside,
+    "DiracDelta": DiracDelta,
     "pi": pi,
     "E": E,
 }
@@ -57,11 +62,21 @@ ALLOWED_FUNCTIONS = {
 LOCAL_DICT = {"x": x, "y": y_func, "Derivative": Derivative}
 LOCAL_DICT.update(ALLOWED_FUNCTIONS)
 
+# Exactas: M dx + N dy = 0 (sin espacios, con ** como potencia)
+EXACT_FORM = re.compile(r"^(?P<M>.*?)dx\+(?P<N>.*?)dy=0$", re.IGNORECASE)
 
-def normalize_equation(raw_equation: str) -> Tuple[str, List[str]]:
+
+def _prime_to_derivative(match) -> str:
+    name, order = match.group(1), len(match.group(2))
+    return f"Derivative({name}(x),x)" if order == 1 else f"Derivative({name}(x),x,{order})"
+
+
+def normalize_equation(raw_equation: str, functions: Optional[Sequence[str]] = None) -> Tuple[str, List[str]]:
     """
     Normaliza la ecuación y separa condiciones iniciales.
     Separadores aceptados: ';', saltos de línea o coma seguida de y(.
+    Las primas de cualquier orden (y''', u'') pasan a Derivative; `functions`
+    agrega incógnitas de sistemas que, como y, pueden escribirse sin (x).
     """
     if not raw_equation:
         raise ValueError("Ecuación vacía")
@@ -73,18 +88,14 @@ def normalize_equation(raw_equation: str) -> Tuple[str, List[str]]:
 
     equation_str, *ic_segments = segments
 
-    eq = (
-        equation_str.replace(" ", "")
-        .replace("dy/dx", "Derivative(y(x),x)")
-        .replace("y''", "Derivative(y(x),x,2)")
-        .replace("y'", "Derivative(y(x),x)")
-        .replace("^", "**")
-    )
+    eq = equation_str.replace(" ", "").replace("dy/dx", "Derivative(y(x),x)").replace("^", "**")
+    eq = re.sub(r"\b([a-zA-Z]\w*)('+)", _prime_to_derivative, eq)
     # y -> y(x) cuando no está en modo función
-    eq = re.sub(r"\by\b(?!\()", "y(x)", eq)
+    for name in ["y", *(functions or [])]:
+        eq = re.sub(rf"\b{re.escape(name)}\b(?!\()", f"{name}(x)", eq)
 
     # Exactas: M dx + N dy = 0  -> Derivative(y,x) = -M/N
-    match = re.match(r"^(?P<M>.*?)dx\+(?P<N>.*?)dy=0$", eq, re.IGNORECASE)
+    match = EXACT_FORM.match(eq)
     if match:
         M = match.group("M")
         N = match.group("N")
@@ -93,15 +104,31 @@ def normalize_equation(raw_equation: str) -> Tuple[str, List[str]]:
     return eq, ic_segments
 
 
-def parse_sympy_expression(expr: str):
-    return parse_expr(expr, transformations=TRANSFORMATIONS, local_dict=LOCAL_DICT)
+def exact_form(raw_equation: str) -> Optional[Tuple[str, str]]:
+    """(M, N) si la ecuación viene como M(x,y) dx + N(x,y) dy = 0 (con y como variable)."""
+    equation = re.split(r"[;\n]+", raw_equation)[0].replace(" ", "").replace("^", "**")
+    match = EXACT_FORM.match(equation)
+    return (match.group("M"), match.group("N")) if match else None
+
+
+def _local_dict(functions: Optional[Sequence[str]] = None) -> Dict:
+    """Agrega funciones incógnita extra (sistemas) para que no se separen en producto."""
+    if not functions:
+        return LOCAL_DICT
+    local = dict(LOCAL_DICT)
+    local.update({name: Function(name) for name in functions})
+    return local
+
+
+def parse_sympy_expression(expr: str, functions: Optional[Sequence[str]] = None):
+    return parse_expr(expr, transformations=TRANSFORMATIONS, local_dict=_local_dict(functions))
 
 
-def parse_equation(expr: str):
+def parse_equation(expr: str, functions: Optional[Sequence[str]] = None):
     if "=" in expr:
         left, right = expr.split("=")
-        return parse_sympy_expression(left), parse_sympy_expression(right)
-    return parse_sympy_expression(expr), None
+        return parse_sympy_expression(left, functions), parse_sympy_expression(right, functions)
+    return parse_sympy_expression(expr, functions), None
 
 
 def parse_initial_conditions(ic_segments: List[str]) -> Dict:
@@ -0,0 +1,188 @@
+"""
+Análisis de plano de fase para sistemas autónomos 2-D u' = f(u, v), v' = g(u, v).
+
+- Equilibrios: se resuelve f = g = 0 simbólicamente; si SymPy no puede (o no
+  da soluciones reales) se usa Newton vectorizado desde una malla de semillas.
+- El jacobiano se calcula y lambdifica una sola vez por sistema (caché LRU
+  junto con los equilibrios); los autovalores en cada equilibrio salen de
+  NumPy y definen la clasificación.
+- El retrato de fase integra con RK4 todas las trayectorias a la vez (estado
+  de forma (2, N)), hacia adelante y hacia atrás desde una malla de puntos.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+import sympy as sp
+from sympy.utilities.lambdify import lambdify
+
+from ..config import settings
+from .metrics import record_cache, stage
+from .numeric_solver import reduce_to_first_order, rk4_step
+from .sampling import to_json_list
+
+x = sp.symbols("x")
+STATE = sp.symbols("_u _v")
+
+_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _vectorize(args, exprs):
+    """Compila exprs para evaluar sobre arreglos; las constantes se expanden a la forma de la entrada."""
+    compiled = lambdify(args, list(exprs), modules="numpy")
+
+    def evaluate(*arrays):
+        with np.errstate(all="ignore"):
+            values = compiled(*arrays)
+        return np.array(np.broadcast_arrays(*values, *arrays)[: len(values)], dtype=float)
+
+    return evaluate
+
+
+def _symbolic_equilibria(rhs, state) -> List[List[float]]:
+    try:
+        with stage("equilibria"):
+            solutions = sp.solve(rhs, state, dict=True)
+    except (NotImplementedError, ValueError):
+        return []
+    points = []
+    for sol in solutions:
+        if any(s not in sol for s in state):
+            continue  # Curvas de equilibrios (soluciones paramétricas): no se listan
+        values = [complex(sp.N(sol[s])) for s in state]
+        if all(abs(v.imag) < 1e-12 for v in values):
+            points.append([v.real for v in values])
+    return points
+
+
+def _newton_equilibria(F, J, window) -> List[List[float]]:
+    """Newton simultáneo desde una malla de semillas dentro de la ventana."""
+    n = settings.PHASE_NEWTON_SEEDS
+    U, V = np.meshgrid(np.linspace(window[0], window[1], n), np.linspace(window[2], window[3], n))
+    u, v = U.ravel(), V.ravel()
+    with stage("equilibria"), np.errstate(all="ignore"):
+        for _ in range(settings.PHASE_NEWTON_ITER):
+            f, g = F(u, v)
+            a, b, c, d = J(u, v).reshape(4, -1)
+            det = a * d - b * c
+            u, v = u - (d * f - b * g) / det, v - (a * g - c * f) / det
+        f, g = F(u, v)
+    ok = np.isfinite(u) & np.isfinite(v) & (np.hypot(f, g) < 1e-9)
+    points = []
+    for pu, pv in zip(u[ok], v[ok]):
+        if not any(abs(pu - qu) < 1e-6 and abs(pv - qv) < 1e-6 for qu, qv in points):
+            points.append([float(pu), float(pv)])
+    return points
+
+
+def classify(eigenvalues: np.ndarray, tol: float = 1e-9) -> str:
+    re, im = eigenvalues.real, eigenvalues.imag
+    if np.any(np.abs(re) < tol):
+        return "centro (lineal)" if np.all(np.abs(im) > tol) else "no hiperbólico"
+    if np.any(np.abs(im) > tol):
+        return "foco estable" if re[0] < 0 else "foco inestable"
+    if re[0] * re[1] < 0:
+        return "punto silla"
+    return "nodo estable" if re[0] < 0 else "nodo inestable"
+
+
+def _system_analysis(rhs, state, window) -> Dict:
+    """Jacobiano compilado y equilibrios, cacheados por sistema canónico."""
+    key = sp.srepr(tuple(rhs)) + repr(window)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    record_cache("jacobian", cached is not None)
+    if cached is not None:
+        return cached
+
+    jacobian = sp.Matrix(rhs).jacobian(state)
+    with stage("lambdify"):
+        F = _vectorize(state, rhs)
+        J = _vectorize(state, list(jacobian))
+    points = _symbolic_equilibria(rhs, state) or _newton_equilibria(F, J, window)
+    equilibria = []
+    for point in points:
+        matrix = J(*[np.array([p]) for p in point]).reshape(2, 2)
+        eig = np.linalg.eigvals(matrix)
+        equilibria.append(
+            {
+                "point": point,
+                "jacobian": matrix.tolist(),
+                "eigenvalues": [{"re": float(e.real), "im": float(e.imag)} for e in eig],
+                "type": classify(eig),
+            }
+        )
+    result = {"F": F, "jacobian": jacobian, "equilibria": equilibria}
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > settings.PHASE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def _trajectories(F, window, opts) -> List[Dict]:
+    """Integra todas las trayectorias a la vez; las que salen de la ventana ampliada se cortan."""
+    n = opts.grid
+    U, V = np.meshgrid(np.linspace(window[0], window[1], n), np.linspace(window[2], window[3], n))
+    seeds = np.vstack([U.ravel(), V.ravel()])
+    width, height = window[1] - window[0], window[3] - window[2]
+    bounds = (window[0] - width, window[1] + width, window[2] - height, window[3] + height)
+
+    def f(_, S):
+        return F(S[0], S[1])
+
+    paths = []
+    with stage("integrate"), np.errstate(all="ignore"):
+        for h in (opts.step, -opts.step):
+            S = seeds.copy()
+            history = [S]
+            for _ in range(opts.steps):
+                S = rk4_step(f, 0.0, S, h)
+                out = (S[0] < bounds[0]) | (S[0] > bounds[1]) | (S[1] < bounds[2]) | (S[1] > bounds[3])
+                S = np.where(out | ~np.isfinite(S), np.nan, S)
+                history.append(S)
+                if np.all(np.isnan(S)):
+                    break
+            paths.append(np.stack(history))  # (pasos, 2, N)
+
+    trajectories = []
+    forward, backward = paths
+    for i in range(seeds.shape[1]):
+        # Atrás invertido + adelante (sin repetir la semilla)
+        points = np.concatenate([backward[::-1, :, i], forward[1:, :, i]])
+        valid = np.isfinite(points).all(axis=1)
+        points = points[valid]
+        trajectories.append(
+            {"seed": seeds[:, i].tolist(), "u": to_json_list(points[:, 0]), "v": to_json_list(points[:, 1])}
+        )
+    return trajectories
+
+
+def phase_portrait(eqs: Sequence, funcs: Sequence, names: Sequence[str], opts) -> Dict:
+    """Equilibrios clasificados y retrato de fase de un sistema autónomo de dos ecuaciones."""
+    if len(eqs) != 2:
+        raise ValueError("El análisis de plano de fase requiere un sistema de 2 ecuaciones.")
+    reduced = reduce_to_first_order(eqs, funcs)
+    if reduced.dim != 2:
+        raise ValueError("El análisis de plano de fase requiere un sistema de primer orden.")
+    # Símbolos fijos en lugar de los Dummy de la reducción: la clave de caché debe ser estable
+    state = list(STATE)
+    rhs = [expr.xreplace(dict(zip(reduced.args[1:], state))) for expr in reduced.rhs]
+    if any(expr.has(x) for expr in rhs):
+        raise ValueError("El análisis de plano de fase requiere un sistema autónomo (sin x explícita).")
+    window = (opts.u_min, opts.u_max, opts.v_min, opts.v_max)
+    if window[0] >= window[1] or window[2] >= window[3]:
+        raise ValueError("La ventana debe cumplir u_min < u_max y v_min < v_max.")
+
+    analysis = _system_analysis(rhs, state, window)
+    return {
+        "variables": list(names),
+        "jacobian": sp.latex(analysis["jacobian"].subs(dict(zip(state, sp.symbols(list(names)))))),
+        "equilibria": analysis["equilibria"],
+        "trajectories": _trajectories(analysis["F"], window, opts),
+    }
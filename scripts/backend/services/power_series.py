@@ -0,0 +1,281 @@
+"""
+Soluciones en serie de potencias (Taylor y Frobenius) alrededor de x0.
+
+La EDO lineal sum_i P_i(x) y^(i) = g(x) de orden k, con coeficientes
+racionales, se lleva a polinomios en t = x - x0. Con y = sum c_n t^(n + rho)
+el coeficiente de t^(m + rho + s - k) da la recurrencia
+
+    sum_{j <= m} c_{m-j} L_j(m - j + rho) = g_{m + s - k}
+    L_j(sigma) = sum_i P_i[j + s - k + i] * sigma (sigma - 1) ... (sigma - i + 1)
+
+donde s es el orden del cero de P_k en t = 0. L_0 es el polinomio indicial:
+en un punto ordinario (s = 0) sus raíces son 0..k-1 y la serie de rho = 0
+trae las k constantes libres (Taylor); en un punto singular regular cada
+grupo de raíces que difieren en enteros aporta una serie de Frobenius (si en
+una resonancia el lado derecho no se anula la solución lleva log(t) y esa
+raíz se omite).
+
+Los coeficientes se guardan como vectores sobre las constantes libres
+(C1, C2, ... y el término del forzamiento), así la recurrencia no depende de
+las CI, y se calculan en el dominio exacto más chico que contiene a rho y a
+los coeficientes (QQ, QQ<sqrt(2)>, ZZ_I...), sin simplificar expresiones.
+Se cachea por (ecuación, centro) y se extiende bajo demanda: pedir más
+términos solo calcula los que faltan.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import sympy as sp
+
+from ..config import settings
+from .metrics import record_cache, stage
+
+x = sp.symbols("x")
+_t, _rho = sp.symbols("_t _rho")
+
+# Clave del término del forzamiento en los vectores de coeficientes
+FORCING = 0
+
+
+class LogarithmicCase(Exception):
+    """Resonancia con lado derecho no nulo: esa raíz indicial no da una serie de Frobenius."""
+
+
+@dataclass
+class SeriesBranch:
+    rho: sp.Expr
+    # Dominio exacto de la aritmética y datos de la recurrencia convertidos a él
+    domain: Any
+    L: List[List[Any]]
+    forcing: List[Any]
+    # c_n como {constante: coeficiente}; la constante i es C_i y FORCING el término fijo
+    coeffs: List[Dict[int, Any]] = field(default_factory=list)
+
+
+@dataclass
+class SeriesRecurrence:
+    order: int
+    # Orden del cero del coeficiente principal en x0 (0 = punto ordinario)
+    s: int
+    # L[j][i]: coeficiente de sigma^(i descendente) en L_j
+    L: List[List[sp.Expr]]
+    forcing: List[sp.Expr]
+    singularities: List[complex]
+    indicial_roots: Dict
+    branches: List[SeriesBranch] = field(default_factory=list)
+    n_constants: int = 0
+    notes: List[str] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_cache: "OrderedDict[str, SeriesRecurrence]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _eval_L(row: Sequence, sigma):
+    return sum((c * sp.ff(sigma, i) for i, c in enumerate(row) if c != 0), sp.S.Zero)
+
+
+def _branch(rec: "SeriesRecurrence", rho) -> SeriesBranch:
+    K, _ = sp.construct_domain([rho, *(c for row in rec.L for c in row), *rec.forcing], extension=True)
+    K = K if K.is_Field else K.get_field()
+    return SeriesBranch(
+        rho,
+        K,
+        [[K.from_sympy(c) for c in row] for row in rec.L],
+        [K.from_sympy(c) for c in rec.forcing],
+    )
+
+
+def _L_value(K, row: Sequence, sigma):
+    """L_j(sigma) en el dominio K (factorial descendente acumulado)."""
+    total, falling = K.zero, K.one
+    for i, c in enumerate(row):
+        if i:
+            falling = falling * (sigma - K.convert(i - 1))
+        if c != K.zero:
+            total = total + c * falling
+    return total
+
+
+def _extend(rec: SeriesRecurrence, branch: SeriesBranch, n: int) -> None:
+    """Calcula c_m para m = len(coeffs)..n-1 reutilizando los ya guardados."""
+    K, k, J = branch.domain, rec.order, len(branch.L) - 1
+    rho = K.from_sympy(branch.rho)
+    for m in range(len(branch.coeffs), n):
+        rhs: Dict[int, Any] = {}
+        g_index = m + rec.s - k
+        if 0 <= g_index < len(branch.forcing) and branch.forcing[g_index] != K.zero:
+            rhs[FORCING] = branch.forcing[g_index]
+        for j in range(1, min(m, J) + 1):
+            factor = _L_value(K, branch.L[j], K.convert(m - j) + rho)
+            if factor == K.zero:
+                continue
+            for key, value in branch.coeffs[m - j].items():
+                rhs[key] = rhs.get(key, K.zero) - factor * value
+        rhs = {key: v for key, v in rhs.items() if v != K.zero}
+        lead = _L_value(K, branch.L[0], K.convert(m) + rho)
+        if lead == K.zero:
+            if rhs:
+                raise LogarithmicCase(m)
+            rec.n_constants += 1
+            branch.coeffs.append({rec.n_constants: K.one})
+        else:
+            branch.coeffs.append({key: v / lead for key, v in rhs.items()})
+
+
+def _polynomial_form(eq, func, x0):
+    """Coeficientes P_0..P_k y forzamiento g como listas ascendentes en t = x - x0."""
+    expr = eq.lhs - eq.rhs if isinstance(eq, sp.Equality) else eq
+    order = max((d.derivative_count for d in expr.atoms(sp.Derivative) if d.expr == func), default=0)
+    if order == 0:
+        raise ValueError("La ecuación no contiene derivadas de y.")
+    slots = sp.symbols(f"_d0:{order + 1}")
+    flat = expr.xreplace(dict(zip([func] + [func.diff(x, k) for k in range(1, order + 1)], slots)))
+    if flat.has(func.func):
+        raise ValueError("El modo serie requiere una EDO lineal en y y sus derivadas.")
+    coeffs = [flat.diff(d) for d in slots]
+    forcing = -(flat - sum(c * d for c, d in zip(coeffs, slots)))
+    parts = [sp.together(sp.nsimplify(c, rational=True).subs(x, _t + x0)) for c in [*coeffs, forcing]]
+    if any(p.has(*slots) or not p.is_rational_function(_t) for p in parts):
+        raise ValueError("El modo serie requiere una EDO lineal con coeficientes racionales en x.")
+    den = sp.lcm_list([sp.fraction(p)[1] for p in parts])
+    polys = [sp.cancel(p * den) for p in parts]
+    common = sp.gcd_list([p for p in polys if p != 0])
+    polys = [sp.Poly(sp.cancel(p / common), _t) for p in polys]
+    return [list(reversed(p.all_coeffs())) for p in polys[:-1]], list(reversed(polys[-1].all_coeffs()))
+
+
+def _build(P: List[List], g: List, order: int) -> SeriesRecurrence:
+    def coef(i, l):
+        return P[i][l] if 0 <= l < len(P[i]) else sp.S.Zero
+
+    lowest = [next((l for l, c in enumerate(p) if c != 0), None) for p in P]
+    s = lowest[order]
+    if any(low is not None and low < s - order + i for i, low in enumerate(lowest)):
+        raise ValueError("x0 es un punto singular irregular: no hay solución en serie de Frobenius.")
+    if s > 0 and any(c != 0 for c in g):
+        raise ValueError("Con forzamiento el modo serie solo admite centros en puntos ordinarios.")
+    J = max(len(p) - 1 - (s - order + i) for i, p in enumerate(P))
+    L = [[coef(i, j + s - order + i) for i in range(order + 1)] for j in range(J + 1)]
+
+    indicial = sp.Poly(sp.expand(_eval_L(L[0], _rho)), _rho)
+    roots = sp.roots(indicial)
+    if sum(roots.values()) != order:
+        raise ValueError("No se pudieron obtener las raíces de la ecuación indicial.")
+    others = [complex(r) for r in sp.Poly(P[order][::-1], _t).nroots() if abs(complex(r)) > 1e-12]
+    rec = SeriesRecurrence(order, s, L, g, others, roots)
+
+    # Raíces que difieren en enteros: se intenta desde la menor, cuya serie absorbe a las demás
+    groups: List[List] = []
+    for r in sorted(roots, key=lambda r: (float(sp.re(r)), float(sp.im(r)))):
+        group = next((gr for gr in groups if (r - gr[0]).is_integer), None)
+        if group is None:
+            groups.append([r])
+        else:
+            group.append(r)
+    for group in groups:
+        for r in group:
+            branch, saved = _branch(rec, r), rec.n_constants
+            try:
+                _extend(rec, branch, int(group[-1] - r) + 1)
+            except LogarithmicCase:
+                rec.n_constants = saved
+                rec.notes.append(f"La raíz indicial {sp.latex(r)} da una solución con log(x - x0), no incluida.")
+                continue
+            rec.branches.append(branch)
+            break
+    for r, mult in roots.items():
+        if mult > 1:
+            rec.notes.append(f"Raíz indicial {sp.latex(r)} repetida: las soluciones con log(x - x0) no se incluyen.")
+    return rec
+
+
+def _recurrence(eq, func, x0) -> SeriesRecurrence:
+    P, g = _polynomial_form(eq, func, x0)
+    key = sp.srepr((tuple(map(tuple, P)), tuple(g)))
+    with _lock:
+        rec = _cache.get(key)
+        if rec is not None:
+            _cache.move_to_end(key)
+    record_cache("series", rec is not None)
+    if rec is not None:
+        return rec
+    rec = _build(P, g, len(P) - 1)
+    with _lock:
+        rec = _cache.setdefault(key, rec)
+        while len(_cache) > settings.SERIES_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return rec
+
+
+def _radius_estimate(values: List[sp.Expr]) -> Optional[float]:
+    """Cauchy-Hadamard sobre la cola: R ~ 1 / max |a_n|^(1/n) (en SymPy: a_n puede no caber en un float)."""
+    tail = [(n, sp.Abs(v)) for n, v in enumerate(values) if n >= max(1, len(values) // 2) and v != 0]
+    if len(tail) < 2:
+        return None
+    return float(min(sp.N(a) ** (-1.0 / n) for n, a in tail))
+
+
+def series_solution(eq, func, x0: float, terms: int, initial: Optional[List[float]] = None) -> Dict:
+    """Serie truncada (terms coeficientes por rama), radio de convergencia estimado y recurrencia usada."""
+    if terms > settings.SERIES_MAX_TERMS:
+        raise ValueError(f"Se admiten hasta {settings.SERIES_MAX_TERMS} términos (SERIES_MAX_TERMS).")
+    center = sp.nsimplify(x0, rational=True)
+    with stage("series"):
+        rec = _recurrence(eq, func, center)
+        with rec.lock:
+            cached = min(len(b.coeffs) for b in rec.branches) if rec.branches else 0
+            for branch in rec.branches:
+                _extend(rec, branch, terms)
+            branches = [
+                (b.rho, [{key: b.domain.to_sympy(v) for key, v in c.items()} for c in b.coeffs[:terms]])
+                for b in rec.branches
+            ]
+            n_constants = rec.n_constants
+
+    constants = {i: sp.Symbol(f"C{i}") for i in range(1, n_constants + 1)}
+    values = {FORCING: sp.S.One, **constants}
+    if initial is not None:
+        if rec.s != 0:
+            raise ValueError("Las condiciones iniciales solo se aplican con centro en un punto ordinario.")
+        # Punto ordinario: C_(m+1) = y^(m)(x0) / m!
+        values.update(
+            {m + 1: sp.nsimplify(v, rational=True) / sp.factorial(m) for m, v in enumerate(initial[: rec.order])}
+        )
+
+    t = x - center
+    expression, numeric = sp.S.Zero, []
+    rendered = []
+    for rho, coeffs in branches:
+        combined = [sp.expand(sp.Add(*(v * values[key] for key, v in c.items()))) for c in coeffs]
+        expression += t**rho * sp.Add(*(c * t**n for n, c in enumerate(combined)))
+        rendered.append({"exponent": sp.latex(rho), "coefficients": [sp.latex(c) for c in combined]})
+        sample = [c.subs({s: 1 for s in constants.values()}) for c in combined]
+        if all(c.is_number for c in sample):
+            numeric.append(sample)
+
+    lowest = min((float(sp.re(rho)) for rho, _ in branches), default=0.0)
+    remainder = sp.Order(t ** (terms + sp.nsimplify(lowest)), (x, center))
+    estimates = [r for r in (_radius_estimate(v) for v in numeric) if r is not None]
+    distance = min((abs(r) for r in rec.singularities), default=None)
+    return {
+        "x0": float(x0),
+        "kind": "taylor" if rec.s == 0 else "frobenius",
+        "terms": terms,
+        "series": f"{sp.latex(expression, order='rev-lex')} + {sp.latex(remainder)}",
+        "expression": expression,
+        "branches": rendered,
+        "indicial_roots": [sp.latex(r) for r in rec.indicial_roots],
+        "constants": [] if initial is not None else [str(c) for c in constants.values()],
+        "radius": {
+            # Cota de Fuchs: distancia a la singularidad más cercana del coeficiente principal
+            "singularity": float(distance) if distance is not None else None,
+            "coefficients": min(estimates) if estimates else None,
+        },
+        "recurrence": {"cached_terms": cached, "computed_terms": max(0, terms - cached)},
+        "notes": list(rec.notes),
+    }
@@ -0,0 +1,159 @@
+"""
+Perfilado bajo demanda de una petición.
+
+Modo `sampling`: un hilo muestrea cada PROFILE_SAMPLE_INTERVAL la pila del hilo
+que resuelve; produce las funciones más calientes y un archivo de pilas
+colapsadas (formato de flamegraph.pl / speedscope).
+Modo `deterministic`: usa cProfile y reporta las funciones por tiempo propio.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+
+def _short_path(filename: str) -> str:
+    """Recorta la ruta al paquete (sympy/..., backend/...) para etiquetas legibles."""
+    parts = filename.replace("\\", "/").split("/")
+    for anchor in ("site-packages", "dist-packages", "scripts"):
+        if anchor in parts:
+            return "/".join(parts[len(parts) - parts[::-1].index(anchor):])
+    return "/".join(parts[-2:])
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class StackSampler:
+    """Muestrea periódicamente la pila de un hilo y acumula pilas colapsadas."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self.stacks.items():
+            labels = stack.split(";")
+            own[labels[-1]] += count
+            for label in set(labels):
+                inclusive[label] += count
+        total = self.samples or 1
+        return [
+            {
+                "function": label,
+                "self": count,
+                "total": inclusive[label],
+                "self_pct": round(100 * count / total, 2),
+            }
+            for label, count in own.most_common(limit)
+        ]
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+def _cprofile_top(prof: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(prof)
+    rows = []
+    for (filename, lineno, name), (_, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{name} ({_short_path(filename)}:{lineno})",
+                "calls": nc,
+                "self": round(tt, 6),
+                "total": round(ct, 6),
+            }
+        )
+    rows.sort(key=lambda row: row["self"], reverse=True)
+    return rows[:limit]
+
+
+def _profile_path(label: str, suffix: str) -> str:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{os.getpid()}.{suffix}"
+    return os.path.join(settings.PROFILE_DIR, name)
+
+
+@contextmanager
+def _deterministic(label: str, report: Dict[str, Any]):
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        report["unit"] = "seconds"
+        report["top"] = _cprofile_top(prof, settings.PROFILE_TOP)
+        try:
+            report["file"] = _profile_path(label, "pstats")
+            prof.dump_stats(report["file"])
+        except OSError:
+            report["file"] = None
+
+
+@contextmanager
+def _sampling(label: str, report: Dict[str, Any]):
+    sampler = StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        report["unit"] = "samples"
+        report["samples"] = sampler.samples
+        report["top"] = sampler.top(settings.PROFILE_TOP)
+        try:
+            report["file"] = _profile_path(label, "folded")
+            with open(report["file"], "w", encoding="utf-8") as fh:
+                fh.write(sampler.folded())
+        except OSError:
+            report["file"] = None
+
+
+@contextmanager
+def profile_request(label: str, mode: Optional[str] = None):
+    """Perfila el bloque; al salir, el dict entregado contiene el resumen."""
+    mode = mode or settings.PROFILE_MODE
+    report: Dict[str, Any] = {"mode": mode}
+    runner = _deterministic if mode == "deterministic" else _sampling
+    start = time.perf_counter()
+    try:
+        with runner(label, report):
+            yield report
+    finally:
+        report["duration"] = time.perf_counter() - start
@@ -0,0 +1,84 @@
+"""
+Progreso y cancelación cooperativa de trabajos largos (API /jobs).
+
+El proceso principal crea un control por trabajo (new_control) y lo pasa al
+worker junto con el trabajo; mientras corre, tracking lo deja disponible en
+una ContextVar. Las integraciones numéricas suman sus pasos con advance cada
+EVERY iteraciones y, si el trabajo fue cancelado, abortan con JobCancelled.
+Los cálculos simbólicos no pueden interrumpirse a mitad de dsolve: su
+resultado simplemente se descarta.
+
+En SOLVER_POOL_MODE=process el control es un Namespace de un Manager de
+multiprocessing, compartido entre procesos; con hilos basta un objeto común.
+"""
+
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+# Pasos entre actualizaciones (en modo proceso cada actualización es una llamada al Manager)
+EVERY = 256
+
+_current: ContextVar[Optional[Any]] = ContextVar("job_control", default=None)
+_manager = None
+_manager_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """El trabajo fue cancelado mientras corría."""
+
+
+class JobControl:
+    def __init__(self):
+        self.steps = 0
+        self.cancelled = False
+        self.started_at: Optional[float] = None
+
+
+def new_control(mode: str = "thread"):
+    """Control compartido con el worker: objeto simple con hilos, Namespace del Manager con procesos."""
+    global _manager
+    if mode != "process":
+        return JobControl()
+    with _manager_lock:
+        if _manager is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _manager = multiprocessing.get_context(method).Manager()
+    return _manager.Namespace(steps=0, cancelled=False, started_at=None)
+
+
+def shutdown():
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
+
+
+@contextmanager
+def tracking(control):
+    """Expone `control` al código del worker durante el trabajo (no hace nada si es None)."""
+    if control is None:
+        yield
+        return
+    if control.cancelled:
+        raise JobCancelled("Trabajo cancelado.")
+    control.started_at = time.time()
+    token = _current.set(control)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def advance(steps: int):
+    """Suma pasos completados al trabajo en curso y aborta si fue cancelado."""
+    control = _current.get()
+    if control is None or not steps:
+        return
+    control.steps += steps
+    if control.cancelled:
+        raise JobCancelled("Trabajo cancelado.")
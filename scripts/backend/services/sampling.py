@@ -0,0 +1,142 @@
+"""
+Evaluación de soluciones simbólicas sobre una malla para graficar.
+
+Explícitas y = f(x): se lambdifica f una vez y se evalúa sobre un linspace.
+Implícitas F(x, y) = 0: se evalúa F en una malla con una sola llamada
+vectorizada y se extrae la curva de nivel cero con marching squares.
+Las curvas se devuelven como arreglos x, y donde None separa tramos.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import sympy as sp
+from sympy.utilities.lambdify import lambdify
+
+from ..config import settings
+from .metrics import stage
+
+x = sp.symbols("x")
+Y = sp.Dummy("Y")
+CONSTANT_NAME = re.compile(r"^C\d*$")
+
+
+def to_json_list(values: np.ndarray) -> List[Optional[float]]:
+    """Arreglo -> lista JSON; NaN/Inf (y complejos) pasan a None."""
+    values = np.asarray(values)
+    if np.iscomplexobj(values):
+        real = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+    else:
+        real = values.astype(float)
+    out = np.round(real, settings.SAMPLE_DECIMALS).tolist()
+    return [v if np.isfinite(v) else None for v in out]
+
+
+def _bind_constants(expr, constants: Optional[Dict[str, float]]):
+    free = sorted((s for s in expr.free_symbols if CONSTANT_NAME.match(s.name)), key=lambda s: s.name)
+    values = constants or {}
+    missing = [s.name for s in free if s.name not in values]
+    if missing:
+        raise ValueError(
+            f"La solución tiene constantes libres ({', '.join(missing)}); "
+            "indícalas en sample.constants o usa condiciones iniciales."
+        )
+    return expr.subs({s: values[s.name] for s in free})
+
+
+def _eval_grid(expr, args, *arrays):
+    f = lambdify(args, expr, modules="numpy")
+    with np.errstate(all="ignore"):
+        values = f(*arrays)
+    return np.broadcast_to(values, np.broadcast(*arrays).shape)
+
+
+def _explicit(rhs, opts) -> Dict:
+    xs = np.linspace(opts.x_min, opts.x_max, opts.points)
+    ys = _eval_grid(rhs, (x,), xs)
+    return {"kind": "explicit", "x": to_json_list(xs), "y": to_json_list(ys)}
+
+
+def _marching_squares(xs: np.ndarray, ys: np.ndarray, F: np.ndarray):
+    """Segmentos de la curva F = 0; devuelve arreglos (k, 2) de extremos p y q."""
+    F = np.where(np.isfinite(F), F, np.nan)
+    X, Yg = np.meshgrid(xs, ys)
+
+    def crossing(fa, fb, xa, xb, ya, yb):
+        valid = (np.sign(fa) != np.sign(fb)) & np.isfinite(fa) & np.isfinite(fb)
+        with np.errstate(all="ignore"):
+            t = np.where(valid, fa / (fa - fb), 0.0)
+        return valid, xa + t * (xb - xa), ya + t * (yb - ya)
+
+    f00, f01, f10, f11 = F[:-1, :-1], F[:-1, 1:], F[1:, :-1], F[1:, 1:]
+    x00, x01, x10 = X[:-1, :-1], X[:-1, 1:], X[1:, :-1]
+    y00, y01, y10 = Yg[:-1, :-1], Yg[:-1, 1:], Yg[1:, :-1]
+    # Orden fijo de aristas por celda: abajo, derecha, arriba, izquierda
+    edges = [
+        crossing(f00, f01, x00, x01, y00, y00),
+        crossing(f01, f11, x01, x01, y00, y10),
+        crossing(f10, f11, x10, x01, y10, y10),
+        crossing(f00, f10, x00, x00, y00, y10),
+    ]
+    hits = np.stack([e[0] for e in edges])
+    px = np.stack([e[1] for e in edges])
+    py = np.stack([e[2] for e in edges])
+    count = hits.sum(axis=0)
+
+    starts, ends = [], []
+    two = count == 2
+    if two.any():
+        order = np.argsort(~hits[:, two], axis=0, kind="stable")[:2]
+        cols = np.arange(order.shape[1])
+        sx, sy = px[:, two], py[:, two]
+        starts.append(np.stack([sx[order[0], cols], sy[order[0], cols]], axis=1))
+        ends.append(np.stack([sx[order[1], cols], sy[order[1], cols]], axis=1))
+    four = count == 4
+    if four.any():
+        # Celda ambigua (punto silla): se unen abajo-derecha y arriba-izquierda
+        sx, sy = px[:, four], py[:, four]
+        for a, b in ((0, 1), (2, 3)):
+            starts.append(np.stack([sx[a], sy[a]], axis=1))
+            ends.append(np.stack([sx[b], sy[b]], axis=1))
+    if not starts:
+        return np.empty((0, 2)), np.empty((0, 2))
+    return np.concatenate(starts), np.concatenate(ends)
+
+
+def _implicit(F, opts) -> Dict:
+    n = min(opts.points, settings.SAMPLE_MAX_GRID)
+    xs = np.linspace(opts.x_min, opts.x_max, n)
+    ys = np.linspace(opts.y_min, opts.y_max, n)
+    X, Yg = np.meshgrid(xs, ys)
+    values = np.asarray(_eval_grid(F, (x, Y), X, Yg))
+    if np.iscomplexobj(values):
+        values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+    p, q = _marching_squares(xs, ys, values.astype(float))
+    # Polilínea con separadores: p0, q0, None, p1, q1, None, ...
+    nan = np.full(len(p), np.nan)
+    seg_x = np.stack([p[:, 0], q[:, 0], nan], axis=1).ravel()
+    seg_y = np.stack([p[:, 1], q[:, 1], nan], axis=1).ravel()
+    return {"kind": "implicit", "segments": len(p), "x": to_json_list(seg_x), "y": to_json_list(seg_y)}
+
+
+def _sample_one(sol, opts) -> Dict:
+    func_y = sp.Function("y")(x)
+    if isinstance(sol, sp.Equality) and sol.lhs == func_y and not sol.rhs.has(func_y):
+        return _explicit(_bind_constants(sol.rhs, opts.constants), opts)
+    expr = sol.lhs - sol.rhs if isinstance(sol, sp.Equality) else sol
+    expr = expr.subs({func_y: Y, sp.Symbol("y"): Y})
+    return _implicit(_bind_constants(expr, opts.constants), opts)
+
+
+def sample_solution(solution, opts) -> Dict:
+    """Evalúa la(s) solución(es) en la ventana pedida; los errores quedan en el resultado."""
+    sols = solution if isinstance(solution, (list, tuple)) else [solution]
+    curves = []
+    with stage("sample"):
+        for sol in sols:
+            try:
+                curves.append(_sample_one(sol, opts))
+            except Exception as exc:
+                curves.append({"kind": "error", "error": str(exc)})
+    return {"curves": curves}
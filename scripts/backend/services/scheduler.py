@@ -0,0 +1,194 @@
+"""
+Planificación justa de trabajos de resolución entre clientes.
+
+Cada carril del pool (normal y pesado) tiene un planificador con tantos
+cupos como workers, así la cola interna del executor queda vacía y el orden
+lo decide este módulo:
+- clases de prioridad: `interactive` se despacha siempre antes que `batch`.
+  La clase la fija la petición (priority_for): solo las síncronas del carril
+  normal son `interactive`; X-Priority puede bajarla a `batch` pero nunca
+  subirla, así omitir el header no da ventaja;
+- dentro de una clase, round-robin entre clientes (API key o IP): cada
+  cliente con trabajos en espera recibe un cupo por turno, sin importar
+  cuántos haya encolado;
+- cada cliente tiene a lo sumo SCHEDULER_MAX_INFLIGHT_PER_CLIENT trabajos
+  en ejecución y SCHEDULER_MAX_QUEUED_PER_CLIENT en espera (si no, QueueFull).
+
+Corre en el event loop del proceso principal: no necesita locks.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+from ..config import settings
+from . import metrics
+
+PRIORITIES = ("interactive", "batch")
+
+
+class QueueFull(Exception):
+    """El cliente ya tiene el máximo de trabajos en espera."""
+
+
+@dataclass(eq=False)
+class Ticket:
+    client: str
+    priority: str
+    # Trabajos por delante al encolarse (0 = se despachó de inmediato)
+    position: int = 0
+    enqueued: float = field(default_factory=time.perf_counter)
+    wait: float = 0.0
+    started: bool = False
+    future: Optional[asyncio.Future] = None
+
+    def as_dict(self) -> Dict:
+        return {
+            "priority": self.priority,
+            "queue_position": self.position,
+            "wait_ms": round(self.wait * 1000, 3),
+        }
+
+
+class FairScheduler:
+    def __init__(self, name: str, slots: int, max_inflight: int, max_queued: int):
+        self.name = name
+        self.slots = max(1, slots)
+        self.max_inflight = max(1, max_inflight)
+        self.max_queued = max_queued
+        # prioridad -> cliente -> cola; el orden del OrderedDict es el turno del round-robin
+        self._queues: Dict[str, "OrderedDict[str, Deque[Ticket]]"] = {p: OrderedDict() for p in PRIORITIES}
+        self._inflight: Dict[str, int] = {}
+        self._running = 0
+
+    def queued(self, client: Optional[str] = None) -> int:
+        return sum(
+            len(queue)
+            for queues in self._queues.values()
+            for name, queue in queues.items()
+            if client is None or name == client
+        )
+
+    def _position(self, ticket: Ticket) -> int:
+        """Trabajos que se despacharán antes: clases superiores y los turnos previos del round-robin."""
+        rank = PRIORITIES.index(ticket.priority)
+        ahead = sum(len(q) for p in PRIORITIES[:rank] for q in self._queues[p].values())
+        queues = self._queues[ticket.priority]
+        turn = len(queues.get(ticket.client, ()))
+        ahead += turn
+        ahead += sum(min(len(q), turn + 1) for name, q in queues.items() if name != ticket.client)
+        return ahead
+
+    def _next(self) -> Optional[Ticket]:
+        for priority in PRIORITIES:
+            queues = self._queues[priority]
+            for client in list(queues):
+                if self._inflight.get(client, 0) >= self.max_inflight:
+                    continue
+                queue = queues.pop(client)
+                ticket = queue.popleft()
+                if queue:
+                    queues[client] = queue  # al final del turno
+                return ticket
+        return None
+
+    def _start(self, ticket: Ticket):
+        ticket.started = True
+        ticket.wait = time.perf_counter() - ticket.enqueued
+        self._running += 1
+        self._inflight[ticket.client] = self._inflight.get(ticket.client, 0) + 1
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _dispatch(self):
+        while self._running < self.slots:
+            ticket = self._next()
+            if ticket is None:
+                break
+            self._start(ticket)
+        self._update_gauges()
+
+    def _remove(self, ticket: Ticket):
+        queues = self._queues[ticket.priority]
+        queue = queues.get(ticket.client)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del queues[ticket.client]
+        self._update_gauges()
+
+    def _update_gauges(self):
+        for priority in PRIORITIES:
+            waiting = sum(len(q) for q in self._queues[priority].values())
+            metrics.registry.set_gauge("solver_scheduler_queued", waiting, lane=self.name, priority=priority)
+        # La cola real está acá (el executor nunca recibe más trabajos que workers): total de ambos carriles
+        metrics.registry.set_gauge("solver_pool_queue_depth", sum(s.queued() for s in schedulers.values()))
+
+    async def acquire(self, client: str, priority: str = "interactive") -> Ticket:
+        """Espera un cupo; el ticket informa la posición inicial en la cola y la espera."""
+        if self.queued(client) >= self.max_queued:
+            metrics.registry.inc("solver_scheduler_rejected_total", lane=self.name)
+            raise QueueFull(f"Demasiados trabajos en espera para este cliente (máximo {self.max_queued}).")
+        ticket = Ticket(client, priority)
+        ticket.future = asyncio.get_running_loop().create_future()
+        ticket.position = self._position(ticket)
+        self._queues[priority].setdefault(client, deque()).append(ticket)
+        self._dispatch()
+        if ticket.started:
+            ticket.position = 0
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.started:
+                self.release(ticket)
+            else:
+                self._remove(ticket)
+            raise
+        metrics.registry.observe("solver_scheduler_wait_seconds", ticket.wait, lane=self.name, priority=priority)
+        return ticket
+
+    def release(self, ticket: Ticket):
+        self._running -= 1
+        remaining = self._inflight.get(ticket.client, 1) - 1
+        if remaining:
+            self._inflight[ticket.client] = remaining
+        else:
+            self._inflight.pop(ticket.client, None)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, client: str, priority: str = "interactive"):
+        ticket = await self.acquire(client, priority)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+
+def priority_for(requested: Optional[str], lane: str, background: bool = False) -> str:
+    """Clase efectiva: `batch` en el carril pesado, en /jobs o si el cliente la pide; si no, `interactive`."""
+    if requested == "batch" or lane == "heavy" or background:
+        return "batch"
+    return "interactive"
+
+
+def _make(name: str, slots: int) -> FairScheduler:
+    return FairScheduler(
+        name, slots, settings.SCHEDULER_MAX_INFLIGHT_PER_CLIENT, settings.SCHEDULER_MAX_QUEUED_PER_CLIENT
+    )
+
+
+schedulers: Dict[str, FairScheduler] = {
+    "normal": _make("normal", settings.SOLVER_WORKERS),
+    "heavy": _make("heavy", settings.SOLVER_HEAVY_WORKERS),
+}
+
+
+def for_lane(lane: str) -> FairScheduler:
+    # Sin workers pesados el carril pesado corre en el pool normal y comparte sus cupos
+    if lane == "heavy" and settings.SOLVER_HEAVY_WORKERS > 0:
+        return schedulers["heavy"]
+    return schedulers["normal"]
@@ -0,0 +1,65 @@
+"""
+Coalescencia de peticiones idénticas concurrentes (single-flight).
+
+Mientras una resolución está en curso, las peticiones con la misma clave
+esperan ese mismo cálculo en lugar de lanzar otro dsolve. El cálculo corre
+en su propia tarea, así que si el cliente que lo inició se desconecta los
+demás igual reciben el resultado. Las etapas que mide el cálculo se
+registran en el histograma una sola vez; cada petición las copia a su
+Server-Timing.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from . import metrics
+
+# Campos que no cambian el resultado del solver (Qwen se consulta después)
+KEY_EXCLUDE = {"with_qwen", "profile"}
+
+
+def _canonical_equation(text: str) -> str:
+    return re.sub(r"\s+", "", text)
+
+
+def request_key(job: str, req) -> str:
+    """Clave canónica: ecuación(es) sin espacios + CI + método + parámetros numéricos."""
+    data = req.model_dump(exclude=KEY_EXCLUDE)
+    if "equation" in data:
+        data["equation"] = _canonical_equation(data["equation"])
+    if "equations" in data:
+        data["equations"] = [_canonical_equation(eq) for eq in data["equations"]]
+    return job + ":" + json.dumps(data, sort_keys=True, default=str)
+
+
+class SingleFlight:
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Resultado de fn() compartido por clave; el bool indica si se sumó a un cálculo ya en curso."""
+        task = self._calls.get(key)
+        shared = task is not None
+        metrics.record_cache(self.name, shared)
+        if task is None:
+            task = asyncio.ensure_future(self._run(fn))
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        result, timings = await asyncio.shield(task)
+        metrics.replay_stages(timings, observe=False)
+        return result, shared
+
+    @staticmethod
+    async def _run(fn):
+        # La tarea copia el contexto de quien la inició: lista propia para no mezclar sus etapas con esa petición
+        timings = metrics.begin_request()
+        return await fn(), timings
+
+
+inflight = SingleFlight()
@@ -0,0 +1,86 @@
+"""
+Campo de direcciones de EDO de primer orden y' = f(x, y).
+
+f se compila una vez con numeric_solver.build_rhs_scalar y se evalúa sobre
+toda la malla en una única llamada vectorizada. Se devuelven los vectores
+(1, f) normalizados como arreglos planos (fila por fila en y) y el resultado
+se guarda por (ecuación, ventana, resolución).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from sympy import Eq, Function, symbols
+
+from ..config import settings
+from ..models.schemas import FieldRequest, FieldResponse
+from . import parser
+from .metrics import record_cache, stage
+from .numeric_solver import build_rhs_scalar, derivative_order
+from .sampling import to_json_list
+
+x = symbols("x")
+
+_cache: "OrderedDict[tuple, FieldResponse]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cache_key(req: FieldRequest) -> tuple:
+    return ("".join(req.equation.split()), req.x_min, req.x_max, req.y_min, req.y_max, req.nx, req.ny)
+
+
+def direction_field(req: FieldRequest) -> FieldResponse:
+    """Campo normalizado para la ventana y resolución pedidas (con caché LRU)."""
+    key = _cache_key(req)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+    record_cache("field", cached is not None)
+    if cached is not None:
+        return cached
+
+    result = _compute(req)
+    with _lock:
+        _cache[key] = result
+        while len(_cache) > settings.FIELD_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def _compute(req: FieldRequest) -> FieldResponse:
+    if req.x_min >= req.x_max or req.y_min >= req.y_max:
+        raise ValueError("La ventana debe cumplir x_min < x_max e y_min < y_max.")
+    with stage("parse"):
+        eq_str, _ = parser.normalize_equation(req.equation)
+        left, right = parser.parse_equation(eq_str)
+        if right is None:
+            raise ValueError("La ecuación debe ser una igualdad y' = f(x, y).")
+        eq_obj = Eq(left, right)
+    func = Function("y")
+    if derivative_order(eq_obj, func(x)) != 1:
+        raise ValueError("El campo de direcciones solo aplica a ecuaciones de primer orden.")
+
+    f = build_rhs_scalar(eq_obj, func, vectorized=True)
+    xs = np.linspace(req.x_min, req.x_max, req.nx)
+    ys = np.linspace(req.y_min, req.y_max, req.ny)
+    with stage("field"):
+        X, Y = np.meshgrid(xs, ys)
+        with np.errstate(all="ignore"):
+            slopes = np.broadcast_to(np.asarray(f(X, Y), dtype=float), X.shape)
+            norm = np.sqrt(1.0 + slopes**2)
+            u, v = 1.0 / norm, slopes / norm
+            # Pendiente infinita: vector vertical
+            vertical = np.isinf(slopes)
+            u = np.where(vertical, 0.0, u)
+            v = np.where(vertical, np.sign(slopes), v)
+    with stage("serialize"):
+        return FieldResponse(
+            originalEquation=req.equation,
+            x=to_json_list(xs),
+            y=to_json_list(ys),
+            u=to_json_list(u.ravel()),
+            v=to_json_list(v.ravel()),
+            shape=[req.ny, req.nx],
+        )
@@ -0,0 +1,421 @@
+"""
+Lógica de resolución de /solve y /solve/system, independiente de FastAPI.
+
+Se ejecuta dentro del pool de workers (ver worker_pool), por eso importa
+SymPy/NumPy solo cuando el módulo se carga en el worker y comunica los
+errores de entrada como ValueError (el router los traduce a HTTP 400).
+"""
+
+
+import numpy as np
+from sympy import Derivative, Eq, Function, Symbol, latex, symbols
+
+from ..config import settings
+from ..models.schemas import SeriesOptions, SolveRequest, SolveResponse, SystemSolveRequest, ValidateRequest
+from . import (
+    accuracy,
+    complexity,
+    linear_system,
+    metrics,
+    multiprecision,
+    numeric_solver,
+    parser,
+    phase,
+    power_series,
+    sampling,
+    symbolic_solver,
+    verifier,
+)
+from . import steps as stepgen
+from .advanced_solver import advanced_solver
+
+x = symbols("x")
+
+
+def ci_dict_to_adv_ics(ci_dict: dict) -> dict:
+    """Convierte las CI parseadas a formato {'x0':..., 'y0':..., 'yp0':..., 'ypp0':...}."""
+    if not ci_dict:
+        return {}
+    adv = {}
+    for key, val in ci_dict.items():
+        try:
+            # key puede ser y(x0) o Derivative(y(x), x).subs(x, x0)
+            if hasattr(key, "func") and key.func.__name__ == "y":
+                x0_val = key.args[0]
+                adv.setdefault("x0", x0_val)
+                adv["y0"] = val
+            elif key.is_Number:
+                continue
+            elif key.is_Derivative:
+                order = key.derivative_count
+                x0_val = key.args[0].args[0]
+                adv.setdefault("x0", x0_val)
+                if order == 1:
+                    adv["yp0"] = val
+                elif order == 2:
+                    adv["ypp0"] = val
+            elif hasattr(key, "subs"):
+                # Derivada con .subs(x, x0)
+                if key.has(Derivative):
+                    order = list(key.atoms(Derivative))[0].derivative_count
+                    x0_candidates = key.atoms(Symbol)
+                    if x not in x0_candidates:
+                        for sym in x0_candidates:
+                            adv.setdefault("x0", sym)
+                    if order == 1:
+                        adv["yp0"] = val
+                    elif order == 2:
+                        adv["ypp0"] = val
+        except Exception:
+            continue
+    return adv
+
+
+def request_adv_ics(ic) -> dict:
+    """CI del request en formato del solver avanzado; `derivatives` reemplaza a y1/y2 como en el numérico."""
+    derivatives = ic.derivatives if ic.derivatives is not None else [ic.y1, ic.y2]
+    return {"x0": ic.x0, "y0": ic.y0, "derivatives": list(derivatives)}
+
+
+def scalar_initial_state(ic, order: int) -> list:
+    """Estado inicial (y, y', ..., y^(n-1)) de una EDO escalar de orden n."""
+    derivatives = ic.derivatives if ic.derivatives is not None else [ic.y1, ic.y2]
+    values = [ic.y0, *[v for v in derivatives if v is not None]]
+    if len(values) < order:
+        raise ValueError(
+            f"Una EDO de orden {order} requiere {order} valores iniciales: y0 y derivatives "
+            f"con y'(x0) ... y^({order - 1})(x0)."
+        )
+    return values[:order]
+
+
+def require_symplectic_compatible(method: str, reduced) -> None:
+    """Los simplécticos solo aplican a q'' = a(x, q) (aceleración sin velocidades)."""
+    if numeric_solver.is_symplectic(method) and not reduced.separable_second_order:
+        raise ValueError(
+            f"{method} requiere ecuaciones de segundo orden con aceleración independiente de las velocidades "
+            "(q'' = a(x, q)); usa numeric:rk4."
+        )
+
+
+def route_request(req: SolveRequest, eq_obj, measured: complexity.Complexity):
+    """
+    Elige la ruta según la complejidad medida: las lineales de primer orden sin
+    tipo van directo al factor integrante, y las pesadas con CI se integran
+    numéricamente en lugar de intentar dsolve. Devuelve (petición, ruta).
+    """
+    if req.method != "symbolic" or req.equation_type not in (None, "general"):
+        return req, "requested"
+    if complexity.is_heavy(measured):
+        if settings.COMPLEXITY_NUMERIC_FALLBACK and req.initial_conditions and isinstance(eq_obj, Eq):
+            return req.model_copy(update={"method": "numeric:rk4"}), "numeric_fallback"
+        return req, "symbolic"
+    if req.equation_type is None and measured.order == 1 and not measured.nonlinear:
+        return req.model_copy(update={"equation_type": "linear"}), "fast"
+    return req, "symbolic"
+
+
+def solve(req: SolveRequest) -> SolveResponse:
+    """Resuelve /solve (simbólico o numérico); los errores de entrada son ValueError."""
+    with metrics.stage("parse"):
+        eq_str, ci_segments = parser.normalize_equation(req.equation)
+        ci_dict = parser.parse_initial_conditions(ci_segments) if ci_segments else {}
+        left, right = parser.parse_equation(eq_str)
+        eq_obj = Eq(left, right) if right is not None else left
+
+    with metrics.stage("complexity"):
+        measured = complexity.measure(eq_obj, Function("y")(x))
+    reason = complexity.rejection(measured)
+    if reason:
+        raise ValueError(reason)
+    req, route = route_request(req, eq_obj, measured)
+    response = solve_parsed(req, eq_str, ci_dict, eq_obj)
+    response.routing = {"route": route, **measured.as_dict()}
+    return response
+
+
+def solve_parsed(req: SolveRequest, eq_str: str, ci_dict: dict, eq_obj) -> SolveResponse:
+    """Resolución de una ecuación ya parseada por el método (y tipo) de la petición."""
+    if req.method == "series":
+        return solve_series(req, eq_obj, ci_dict)
+
+    # Numérico
+    if req.method.startswith("numeric"):
+        if not req.initial_conditions:
+            raise ValueError("Método numérico requiere condiciones iniciales.")
+        if not isinstance(eq_obj, Eq):
+            raise ValueError("La ecuación debe estar en forma explícita para método numérico.")
+        func = Function("y")
+        order = numeric_solver.derivative_order(eq_obj, func(x))
+        ic = req.initial_conditions
+        event_exprs = [
+            parser.parse_sympy_expression(parser.normalize_equation(ev)[0]) for ev in req.events or []
+        ]
+        h = req.step or 0.1
+        n = req.steps or 50
+        step = numeric_solver.stepper(req.method)
+        if order <= 1 and req.precision == "float64" and not numeric_solver.is_symplectic(req.method):
+            f = numeric_solver.build_rhs_scalar(eq_obj, func)
+            y0, labels, index = ic.y0, ["y"], None
+            run = multiprecision.PrecisionRun(
+                numeric_solver.integrate(
+                    step,
+                    f,
+                    ic.x0,
+                    y0,
+                    h,
+                    n,
+                    events=numeric_solver.build_event_functions(event_exprs, func),
+                    stop_on_event=req.stop_on_event,
+                ),
+                f,
+            )
+        else:
+            # Orden n (o precisión múltiple): estado (y, y', ..., y^(n-1)) sobre los integradores vectoriales
+            reduced = numeric_solver.reduce_to_first_order([eq_obj], [func])
+            require_symplectic_compatible(req.method, reduced)
+            labels, index = reduced.labels(), 0
+            y0 = np.array(scalar_initial_state(ic, max(order, 1)), dtype=float)
+
+            def build(modules):
+                f = reduced.f if modules == "numpy" else reduced.compile(modules)
+                return f, numeric_solver.build_event_functions(event_exprs, func, index, modules)
+
+            run = multiprecision.integrate_with_precision(
+                step, build, ic.x0, y0, h, n, req.precision, req.dps, req.stop_on_event
+            )
+        res = run.result
+        report = None
+        if req.accuracy:
+            # En mpmath run.f ya está ligada al contexto de la corrida: el doblado de paso usa su precisión
+            report = accuracy.accuracy_report(req.method, step, run.f, eq_obj, ic.x0, y0, h, res, req.accuracy)
+        with metrics.stage("serialize"):
+            trace = [
+                {"x": float(xi), **dict(zip(labels, np.atleast_1d(yi).astype(float).tolist()))}
+                for xi, yi in zip(res.xs, res.ys)
+            ]
+            events = [
+                {"event": ev["event"], "x": float(ev["x"]), "y": float(np.atleast_1d(ev["y"])[0])}
+                for ev in res.events
+            ]
+        return SolveResponse(
+            originalEquation=req.equation,
+            solution="Trayectoria numérica",
+            steps=stepgen.numeric_steps(req.method, h, len(res.xs) - 1, res.status, order),
+            numeric_trace=trace,
+            events=events or None,
+            termination=res.status,
+            accuracy=report,
+            precision=run.info if req.precision != "float64" else None,
+        )
+
+    # Simbólico con solver avanzado según tipo
+    adv_map = {
+        "general": advanced_solver.solve_general,
+        "separable": advanced_solver.solve_separable,
+        "homogeneous": advanced_solver.solve_homogeneous,
+        "linear": advanced_solver.solve_linear,
+        "bernoulli": advanced_solver.solve_bernoulli,
+        "second_order_const": advanced_solver.solve_second_order_constant_coeff,
+        "laplace": advanced_solver.solve_laplace,
+        "reducible": advanced_solver.solve_reducible_to_first_order,
+    }
+
+    # Mezclar CI de request + las extraídas del string
+    merged_adv_ics = request_adv_ics(req.initial_conditions) if req.initial_conditions else {}
+    # Complementar con las CI parseadas del string
+    merged_adv_ics = {k: v for k, v in merged_adv_ics.items() if v is not None}
+    parsed_adv_ics = ci_dict_to_adv_ics(ci_dict)
+    merged_adv_ics.update({k: v for k, v in parsed_adv_ics.items() if v is not None})
+
+    if req.equation_type == "exact":
+        # M y N se toman de la entrada original: la normalizada ya está en forma y' = -M/N
+        exact = parser.exact_form(req.equation)
+        if exact:
+            result = advanced_solver.solve_exact(*exact)
+        else:
+            raise ValueError("Para exactas usa formato M(x,y)dx + N(x,y)dy = 0")
+    elif req.equation_type == "integrating_factor":
+        exact = parser.exact_form(req.equation)
+        if exact:
+            result = advanced_solver.find_integrating_factor(*exact)
+        else:
+            raise ValueError("Para factor integrante usa formato M(x,y)dx + N(x,y)dy = 0")
+    elif req.equation_type in adv_map:
+        # Usar la ecuación ya normalizada para evitar problemas con '^' y notación
+        result = adv_map[req.equation_type](eq_str, initial_conditions=merged_adv_ics or None)
+    else:
+        # Fallback al solver simbólico genérico
+        solutions = symbolic_solver.solve_symbolic(eq_str, ci_dict if ci_dict else None)
+        sols_latex = symbolic_solver.to_latex_list(solutions)
+        return SolveResponse(
+            originalEquation=latex(eq_obj),
+            solution=sols_latex,
+            steps=stepgen.symbolic_steps(
+                req.equation_type,
+                sols_latex[0] if sols_latex else "",
+                latex(eq_obj),
+            ),
+            sample=sampling.sample_solution(solutions, req.sample) if req.sample else None,
+            verification=verifier.verify_solution(eq_obj, solutions) if req.verify else None,
+        )
+
+    if not result.get("success"):
+        raise ValueError(result.get("error", "No se pudo resolver"))
+
+    sol_latex = result.get("solution_latex") or result.get("solution")
+    sample = verification = None
+    if req.sample and req.equation_type != "integrating_factor":
+        sample = sampling.sample_solution(result["solution_expr"], req.sample)
+    if req.verify and req.equation_type != "integrating_factor":
+        verification = verifier.verify_solution(eq_obj, result["solution_expr"])
+    if result.get("steps"):
+        steps = stepgen.derivation_steps(result["method"], result["steps"], sol_latex, latex(eq_obj))
+    else:
+        steps = stepgen.symbolic_steps(req.equation_type or result.get("method", ""), sol_latex, latex(eq_obj))
+    return SolveResponse(
+        originalEquation=req.equation,
+        solution=[sol_latex],
+        steps=steps,
+        sample=sample,
+        verification=verification,
+    )
+
+
+def solve_series(req: SolveRequest, eq_obj, ci_dict: dict) -> SolveResponse:
+    """Serie de Taylor/Frobenius truncada alrededor de x0 con radio de convergencia estimado."""
+    func = Function("y")(x)
+    opts = req.series or SeriesOptions()
+    order = numeric_solver.derivative_order(eq_obj, func)
+    x0 = initial = None
+    if req.initial_conditions:
+        x0, initial = req.initial_conditions.x0, scalar_initial_state(req.initial_conditions, order)
+    elif ci_dict:
+        adv = ci_dict_to_adv_ics(ci_dict)
+        initial = [adv.get(key) for key in ("y0", "yp0", "ypp0")[:order]]
+        if len(initial) < order or any(v is None for v in initial):
+            raise ValueError(f"Una EDO de orden {order} requiere {order} condiciones iniciales en el mismo x0.")
+        x0, initial = float(adv["x0"]), [float(v) for v in initial]
+    center = opts.x0 if opts.x0 is not None else (x0 if x0 is not None else 0.0)
+    if x0 is not None and x0 != center:
+        raise ValueError("Las condiciones iniciales deben darse en el centro de la serie.")
+
+    result = power_series.series_solution(eq_obj, func, center, opts.terms, initial)
+    expression = result.pop("expression")
+    return SolveResponse(
+        originalEquation=req.equation,
+        solution=[result["series"]],
+        steps=stepgen.series_steps(result),
+        sample=sampling.sample_solution(Eq(func, expression), req.sample) if req.sample else None,
+        series=result,
+    )
+
+
+def validate(req: ValidateRequest) -> dict:
+    """Verifica localmente una solución propuesta (explícita o implícita) para /validate."""
+    with metrics.stage("parse"):
+        eq_str, _ = parser.normalize_equation(req.equation)
+        left, right = parser.parse_equation(eq_str)
+        eq_obj = Eq(left, right) if right is not None else left
+        sol_str, _ = parser.normalize_equation(req.proposed_solution)
+        sol_left, sol_right = parser.parse_equation(sol_str)
+        # Sin '=' se interpreta como y = expresión
+        proposed = Eq(sol_left, sol_right) if sol_right is not None else Eq(Function("y")(x), sol_left)
+    return verifier.verify_solution(eq_obj, proposed)
+
+
+def solve_system(req: SystemSolveRequest) -> SolveResponse:
+    """Resuelve /solve/system; los errores de entrada son ValueError."""
+    names = req.variables or [f"y{i+1}" for i in range(len(req.equations))]
+    funcs = [Function(v) for v in names]
+    parsed_eqs = []
+    normalized = []
+    ci_dict = {}
+    with metrics.stage("parse"):
+        for expr in req.equations:
+            eq_str, ic_segments = parser.normalize_equation(expr, names)
+            normalized.append(eq_str)
+            left, right = parser.parse_equation(eq_str, names)
+            parsed_eqs.append(Eq(left, right) if right is not None else left)
+            if ic_segments:
+                ci_dict.update(parser.parse_initial_conditions(ic_segments))
+    for eq, func in zip(parsed_eqs, funcs):
+        reason = complexity.rejection(complexity.measure(eq, func(x)))
+        if reason:
+            raise ValueError(reason)
+
+    if req.phase_portrait:
+        if any(not isinstance(eq, Eq) for eq in parsed_eqs):
+            raise ValueError("Cada ecuación del sistema debe estar en forma de igualdad.")
+        portrait = phase.phase_portrait(parsed_eqs, funcs, names, req.phase_portrait)
+        return SolveResponse(
+            originalEquation="; ".join(req.equations),
+            solution="Análisis de plano de fase",
+            steps=stepgen.phase_steps(portrait),
+            phase=portrait,
+        )
+
+    if req.method.startswith("numeric"):
+        if not req.initial_conditions or not req.initial_conditions.system:
+            raise ValueError("Método numérico para sistema requiere initial_conditions.system con valores iniciales.")
+        if any(not isinstance(eq, Eq) for eq in parsed_eqs):
+            raise ValueError("Cada ecuación del sistema debe estar en forma de igualdad para método numérico.")
+        reduced = numeric_solver.reduce_to_first_order(parsed_eqs, funcs)
+        if len(req.initial_conditions.system) != reduced.dim:
+            raise ValueError(
+                f"initial_conditions.system debe tener {reduced.dim} valores, en orden: "
+                + ", ".join(reduced.labels())
+            )
+        require_symplectic_compatible(req.method, reduced)
+        h = req.step or 0.1
+        n = req.steps or 50
+        y0 = np.array(req.initial_conditions.system, dtype=float)
+        # Lineal de coeficientes constantes: solución exacta por exponencial de matriz (rk4 se reemplaza)
+        linear = None
+        if req.method in ("numeric:rk4", "numeric:expm") and req.precision == "float64":
+            linear = linear_system.constant_coefficient_form(reduced)
+        if req.method == "numeric:expm" and linear is None:
+            raise ValueError("numeric:expm requiere un sistema lineal de coeficientes constantes y' = A y + b.")
+        if linear is not None:
+            method = "numeric:expm"
+            run = multiprecision.PrecisionRun(
+                linear_system.propagate(*linear, req.initial_conditions.x0, y0, h, n), reduced.f
+            )
+        else:
+            method = req.method
+            run = multiprecision.integrate_with_precision(
+                numeric_solver.stepper(req.method),
+                lambda modules: (reduced.f if modules == "numpy" else reduced.compile(modules), []),
+                req.initial_conditions.x0,
+                y0,
+                h,
+                n,
+                req.precision,
+                req.dps,
+            )
+        res = run.result
+        # Sistemas de primer orden conservan las claves y1..yn; los de orden mixto usan u, u', v...
+        order = max(k for _, k in reduced.layout) + 1
+        labels = [f"y{i+1}" for i in range(reduced.dim)] if order == 1 else reduced.labels()
+        with metrics.stage("serialize"):
+            trace = [
+                {"x": float(xi), **{label: float(val) for label, val in zip(labels, vec)}}
+                for xi, vec in zip(res.xs, res.ys)
+            ]
+        return SolveResponse(
+            originalEquation="; ".join(req.equations),
+            solution="Trayectoria numérica",
+            steps=stepgen.numeric_steps(method, h, len(res.xs) - 1, res.status, order),
+            numeric_trace=trace,
+            termination=res.status,
+            precision=run.info if req.precision != "float64" else None,
+        )
+
+    # Simbólico sistema
+    solutions = symbolic_solver.solve_symbolic_system(normalized, names, ci_dict if ci_dict else None)
+    sols_latex = symbolic_solver.to_latex_list(solutions)
+    return SolveResponse(
+        originalEquation="; ".join(req.equations),
+        solution=sols_latex,
+        steps=stepgen.symbolic_steps("sistema", solutions),
+    )
@@ -22,13 +22,130 @@ def symbolic_steps(eq_type: str | None, solution_latex: str | None, original_eq:
     ]
 
 
-def numeric_steps(method: str, h: float, n: int) -> list:
-    """Pasos genéricos para métodos numéricos."""
-    name = "Euler" if method.endswith("euler") else "Runge-Kutta 4"
+def derivation_steps(method: str, derivation: list, solution_latex: str, original_eq: str) -> list:
+    """Pasos reales del método (registrados por el solver) entre la identificación y el resultado."""
     return [
+        {
+            "title": "Identificación",
+            "description": f"Se reconoce la ecuación como {method}.",
+            "equation": original_eq,
+        },
+        *derivation,
+        {
+            "title": "Resultado",
+            "description": "Solución encontrada.",
+            "equation": solution_latex,
+        },
+    ]
+
+
+TERMINATION_MESSAGES = {
+    "event": "La integración se detuvo en el primer evento detectado.",
+    "overflow": "La integración se detuvo: la solución desborda (posible explosión en tiempo finito).",
+    "nonfinite": "La integración se detuvo: aparecieron valores NaN/Inf.",
+}
+
+
+METHOD_NAMES = {
+    "euler": "Euler",
+    "rk4": "Runge-Kutta 4",
+    "verlet": "Velocity Verlet (simpléctico)",
+    "leapfrog": "Leapfrog (simpléctico)",
+    "yoshida4": "Yoshida de orden 4 (simpléctico)",
+    "expm": "Exponencial de matriz (solución exacta)",
+}
+
+
+def numeric_steps(method: str, h: float, n: int, status: str | None = None, order: int = 1) -> list:
+    """Pasos genéricos para métodos numéricos."""
+    name = METHOD_NAMES.get(method.split(":")[-1], method)
+    steps = []
+    if order > 1:
+        # Hasta orden 3 el estado se lista completo: (y, y') o (y, y', y'')
+        if order <= 3:
+            state = ", ".join("y" + "'" * k for k in range(order))
+        else:
+            state = f"y, y', ..., y^({order - 1})"
+        steps.append(
+            {
+                "title": "Reducción a primer orden",
+                "description": f"Se introduce el estado ({state}) y se integra como sistema de primer orden.",
+                "equation": "",
+            }
+        )
+    if method.endswith("expm"):
+        description = f"Sistema lineal de coeficientes constantes: y(x + h) = e^(A h) y(x), {n} puntos con h={h}."
+    else:
+        description = f"Se itera {n} pasos con h={h}."
+    steps.append(
         {
             "title": f"Método {name}",
-            "description": f"Se itera {n} pasos con h={h}.",
+            "description": description,
             "equation": "",
         }
+    )
+    if status in TERMINATION_MESSAGES:
+        steps.append(
+            {
+                "title": "Terminación anticipada",
+                "description": TERMINATION_MESSAGES[status],
+                "equation": "",
+            }
+        )
+    return steps
+
+
+def phase_steps(portrait: dict) -> list:
+    """Pasos del análisis de plano de fase."""
+    steps = [
+        {
+            "title": "Matriz jacobiana",
+            "description": "Se linealiza el sistema alrededor de cada equilibrio.",
+            "equation": portrait["jacobian"],
+        }
+    ]
+    for eq in portrait["equilibria"]:
+        point = ", ".join(f"{v:.4g}" for v in eq["point"])
+        eigen = ", ".join(f"{e['re']:.4g}{e['im']:+.4g}i" for e in eq["eigenvalues"])
+        steps.append(
+            {
+                "title": f"Equilibrio ({point})",
+                "description": f"Autovalores {eigen}: {eq['type']}.",
+                "equation": "",
+            }
+        )
+    if not portrait["equilibria"]:
+        steps.append({"title": "Equilibrios", "description": "No se encontraron equilibrios.", "equation": ""})
+    return steps
+
+
+def series_steps(result: dict) -> list:
+    """Pasos de la solución en serie de potencias."""
+    rec = result["recurrence"]
+    if result["kind"] == "taylor":
+        ansatz = "x0 es un punto ordinario: y = Σ c_n (x - x0)^n."
+    else:
+        roots = ", ".join(result["indicial_roots"])
+        ansatz = f"x0 es un punto singular regular: y = Σ c_n (x - x0)^(n + ρ), con ρ raíz de la ecuación indicial ({roots})."
+    steps = [
+        {"title": "Planteo de la serie", "description": ansatz, "equation": ""},
+        {
+            "title": "Recurrencia",
+            "description": (
+                f"Se igualan coeficientes y se obtienen {result['terms']} términos por serie "
+                f"({rec['computed_terms']} nuevos, {rec['cached_terms']} reutilizados de la caché)."
+            ),
+            "equation": "",
+        },
     ]
+    steps.extend({"title": "Observación", "description": note, "equation": ""} for note in result["notes"])
+    radius = result["radius"]
+    if radius["singularity"] is not None:
+        description = f"La singularidad más cercana está a distancia {radius['singularity']:.4g}: la serie converge al menos en ese radio."
+    else:
+        description = "No hay otras singularidades finitas: la serie converge en todo punto."
+    if radius["coefficients"] is not None:
+        description += f" Estimación por los coeficientes: {radius['coefficients']:.4g}."
+    steps.append({"title": "Radio de convergencia", "description": description, "equation": ""})
+    steps.append({"title": "Serie truncada", "description": "Solución aproximada.", "equation": result["series"]})
+    return steps
@@ -3,6 +3,8 @@ from typing import Dict, List, Optional, Tuple
 from sympy import Eq, Function, latex, symbols
 from sympy import dsolve  # type: ignore
 
+from .advanced_solver import advanced_solver
+from .metrics import stage
 from .parser import parse_equation
 
 x = symbols("x")
@@ -13,7 +15,7 @@ def solve_symbolic(eq_expr: str, ics: Optional[Dict] = None, func: Function = DE
     """Resuelve simbólicamente una ecuación diferencial (1ra o 2da orden) con CI opcionales."""
     left, right = parse_equation(eq_expr)
     eq = Eq(left, right) if right is not None else left
-    solution = dsolve(eq, func(x), ics=ics) if ics else dsolve(eq, func(x))
+    solution = advanced_solver.dsolve_cached(eq, func(x), ics)
     solutions = solution if isinstance(solution, (list, tuple)) else [solution]
     return solutions
 
@@ -24,19 +26,20 @@ def solve_symbolic_system(
     ics: Optional[Dict] = None,
 ) -> List:
     """Resuelve simbólicamente sistemas (si SymPy puede resolverlos)."""
-    funcs = [Function(v) for v in variables] if variables else []
+    names = variables or [f"y{idx+1}" for idx in range(len(eqs))]
     parsed_eqs: List[Eq] = []
-    for idx, expr in enumerate(eqs):
-        func = funcs[idx] if idx < len(funcs) else Function(f"y{idx+1}")
-        left, right = parse_equation(expr)
+    for expr in eqs:
+        left, right = parse_equation(expr, names)
         parsed_eqs.append(Eq(left, right) if right is not None else left)
-    solution = dsolve(parsed_eqs, ics=ics) if ics else dsolve(parsed_eqs)
+    with stage("dsolve"):
+        solution = dsolve(parsed_eqs, ics=ics) if ics else dsolve(parsed_eqs)
     return solution if isinstance(solution, (list, tuple)) else [solution]
 
 
 def to_latex_list(solutions) -> List[str]:
     sols = solutions if isinstance(solutions, (list, tuple)) else [solutions]
-    return [latex(sol) for sol in sols]
+    with stage("latex"):
+        return [latex(sol) for sol in sols]
 
 
 def solution_summary(solutions) -> str:
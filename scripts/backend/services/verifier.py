@@ -0,0 +1,156 @@
+"""
+Verificación local de soluciones de EDO por residuo numérico.
+
+Se sustituye la solución en la ecuación y se evalúa el residuo relativo
+|L - R| / max(1, |L|, |R|) en puntos aleatorios (con semilla fija, aritmética
+compleja para no perder puntos por dominio). Los puntos dudosos se reevalúan
+con mpmath en alta precisión y solo si el resultado no es concluyente se usa
+checkodesol.
+
+Soluciones explícitas y = f(x): se sustituye y(x) y se derivan.
+Soluciones implícitas F(x, y) = C: las derivadas salen de idiff y el residuo
+se evalúa en (x, y) libres, ya que con las constantes libres por cada punto
+pasa un miembro de la familia.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import sympy as sp
+from sympy.solvers.ode import checkodesol
+from sympy.utilities.lambdify import lambdify
+
+from ..config import settings
+from . import multiprecision
+from .metrics import stage
+from .sampling import CONSTANT_NAME
+
+x = sp.symbols("x")
+Y = sp.Dummy("Y")
+
+
+def _order(expr, func) -> int:
+    return max((d.derivative_count for d in expr.atoms(sp.Derivative) if d.expr == func), default=0)
+
+
+def _sides(ode):
+    return (ode.lhs, ode.rhs) if isinstance(ode, sp.Equality) else (ode, sp.Integer(0))
+
+
+def _substitute_explicit(ode, func, rhs):
+    lhs_ode, rhs_ode = _sides(ode)
+    return [side.subs(func, rhs).doit() for side in (lhs_ode, rhs_ode)]
+
+
+def _substitute_implicit(ode, func, sol):
+    F = (sol.lhs - sol.rhs if isinstance(sol, sp.Equality) else sol).subs({func: Y, sp.Symbol("y"): Y})
+    lhs_ode, rhs_ode = _sides(ode)
+    order = max(_order(lhs_ode, func), _order(rhs_ode, func), 1)
+    derivs = {k: sp.idiff(F, Y, x, k) for k in range(1, order + 1)}
+    out = []
+    for side in (lhs_ode, rhs_ode):
+        for k in range(order, 0, -1):
+            side = side.subs(sp.Derivative(func, (x, k)), derivs[k])
+        out.append(side.subs(func, Y))
+    return out
+
+
+def _relative(L, R):
+    return np.abs(L - R) / np.maximum(1.0, np.maximum(np.abs(L), np.abs(R)))
+
+
+def _sample_points(args, rng, n):
+    cols = []
+    for arg in args:
+        if arg == x or arg == Y:
+            cols.append(rng.uniform(-3.0, 3.0, n))
+        else:
+            # Constantes: magnitud moderada y signo al azar, lejos de cero
+            cols.append(rng.uniform(0.5, 2.0, n) * rng.choice([-1.0, 1.0], n))
+    return cols
+
+
+def _numeric_check(L, R, args, rng) -> Dict:
+    n = settings.VERIFY_SAMPLES
+    cols = _sample_points(args, rng, n)
+    f = lambdify(args, [L, R], modules="numpy")
+    with np.errstate(all="ignore"):
+        vals = [np.broadcast_to(np.asarray(v, dtype=complex), (n,)) for v in f(*[c.astype(complex) for c in cols])]
+    res = _relative(vals[0], vals[1])
+    finite = np.isfinite(res)
+    if finite.sum() < settings.VERIFY_MIN_POINTS:
+        return {"status": "inconclusive", "points": int(finite.sum()), "max_residual": None}
+    bad = finite & (res > settings.VERIFY_TOLERANCE)
+    if bad.any():
+        # Reevaluar con mpmath: descarta falsos negativos por cancelación en float64
+        # Contexto propio: mpmath.mp es global y lo comparten los hilos del pool
+        ctx = multiprecision.context(settings.VERIFY_MP_DPS)
+        f_mp = lambdify(args, [L, R], modules=multiprecision.lambdify_modules(ctx))
+        for idx in np.flatnonzero(bad):
+            try:
+                l_mp, r_mp = f_mp(*[ctx.mpf(float(c[idx])) for c in cols])
+                scale = max(1, abs(l_mp), abs(r_mp))
+                res[idx] = float(abs(l_mp - r_mp) / scale)
+            except Exception:
+                res[idx] = np.nan
+        finite = np.isfinite(res)
+        bad = finite & (res > settings.VERIFY_TOLERANCE)
+    max_res = float(res[finite].max()) if finite.any() else None
+    if not bad.any() and finite.sum() >= settings.VERIFY_MIN_POINTS:
+        status = "valid"
+    elif bad.sum() == finite.sum():
+        status = "invalid"
+    else:
+        # Algunos puntos cumplen y otros no (ramas, cortes): no concluyente
+        status = "inconclusive"
+    return {"status": status, "points": int(finite.sum()), "max_residual": max_res}
+
+
+def _verify_one(ode, sol, func, rng) -> Dict:
+    explicit = isinstance(sol, sp.Equality) and sol.lhs == func and not sol.rhs.has(func)
+    L, R = _substitute_explicit(ode, func, sol.rhs) if explicit else _substitute_implicit(ode, func, sol)
+    # Forzamientos/saltos: el residuo se evalúa punto a punto, fuera del soporte de los impulsos
+    L, R = (side.replace(sp.DiracDelta, lambda *args: sp.S.Zero) for side in (L, R))
+    constants = sorted(
+        (s for s in (L.free_symbols | R.free_symbols) if CONSTANT_NAME.match(s.name)), key=lambda s: s.name
+    )
+    args = [x] + ([] if explicit else [Y]) + constants
+    extra = (L.free_symbols | R.free_symbols) - set(args)
+    if extra:
+        return {"status": "inconclusive", "points": 0, "max_residual": None}
+    result = _numeric_check(L, R, args, rng)
+    result["method"] = "numeric"
+    return result
+
+
+def verify_solution(ode, solution, func=None) -> Dict:
+    """Verifica una o varias soluciones; devuelve {'valid', 'method', 'max_residual', ...}."""
+    func = func if func is not None else sp.Function("y")(x)
+    sols: List = list(solution) if isinstance(solution, (list, tuple)) else [solution]
+    rng = np.random.default_rng(settings.VERIFY_SEED)
+    with stage("verify"):
+        checks = []
+        for sol in sols:
+            try:
+                check = _verify_one(ode, sol, func, rng)
+            except Exception:
+                check = {"status": "inconclusive", "points": 0, "max_residual": None, "method": "numeric"}
+            if check["status"] == "inconclusive":
+                check = _checkodesol(ode, sol, func, check)
+            checks.append(check)
+    residuals = [c["max_residual"] for c in checks if c["max_residual"] is not None]
+    return {
+        "valid": all(c["status"] == "valid" for c in checks),
+        "method": "checkodesol" if any(c["method"] == "checkodesol" for c in checks) else "numeric",
+        "max_residual": max(residuals) if residuals else None,
+        "points": sum(c["points"] for c in checks),
+        "solutions": [c["status"] for c in checks],
+    }
+
+
+def _checkodesol(ode, sol, func, previous: Optional[Dict]) -> Dict:
+    try:
+        ok, _ = checkodesol(ode, sol, func)
+    except Exception:
+        return {**(previous or {}), "status": "inconclusive", "method": "checkodesol"}
+    return {**(previous or {}), "status": "valid" if ok else "invalid", "method": "checkodesol"}
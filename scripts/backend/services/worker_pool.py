@@ -0,0 +1,179 @@
+"""
+Pool de workers de resolución.
+
+Los trabajos se identifican por nombre (JOBS) y sus módulos se importan recién
+dentro del worker, de modo que arrancar la app no carga SymPy/NumPy. El pool
+se precalienta en segundo plano resolviendo un set fijo de ecuaciones, así la
+primera petición real no paga las cachés iniciales de dsolve/lambdify.
+
+SOLVER_POOL_MODE=thread (por defecto) usa hilos del mismo proceso.
+SOLVER_POOL_MODE=process usa procesos creados desde un forkserver que ya
+importó SymPy y los servicios (ver forkserver_preload).
+
+Las ecuaciones que el análisis de complejidad marca como pesadas van a un
+carril aparte (SOLVER_HEAVY_WORKERS workers) para no ocupar el pool normal.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+from . import metrics, profiler, progress
+
+logger = logging.getLogger(__name__)
+
+# nombre -> (módulo dentro de services, función)
+JOBS: Dict[str, Tuple[str, str]] = {
+    "solve": ("solve_service", "solve"),
+    "solve_system": ("solve_service", "solve_system"),
+    "validate": ("solve_service", "validate"),
+    "field": ("slope_field", "direction_field"),
+    "warmup": ("worker_pool", "warmup_worker"),
+}
+
+WARMUP_REQUESTS = [
+    {"equation": "dy/dx = x*y", "equation_type": "separable"},
+    {"equation": "dy/dx + y = x", "equation_type": "linear"},
+    {"equation": "y'' + 3*y' + 2*y = 0", "equation_type": "second_order_const"},
+    {"equation": "dy/dx = x - y"},
+    {"equation": "dy/dx = x*y", "method": "numeric:rk4", "initial_conditions": {"x0": 0, "y0": 1}, "steps": 10},
+]
+
+
+PRELOAD_MODULES = ["sympy", "numpy", f"{__package__}.forkserver_preload"]
+
+
+def _resolve(job: str):
+    module_name, func_name = JOBS[job]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, func_name)
+
+
+def execute(job: str, args: tuple, profile_label: Optional[str] = None, control=None):
+    """Corre un trabajo en el worker; devuelve (resultado, etapas, perfil).
+
+    `control` (API /jobs) recibe el progreso y la marca de cancelación.
+    """
+    fn = _resolve(job)
+    report = None
+    with metrics.collect_stages() as timings, progress.tracking(control):
+        if profile_label:
+            with profiler.profile_request(profile_label) as report:
+                result = fn(*args)
+        else:
+            result = fn(*args)
+    return result, timings, report
+
+
+def warmup_worker() -> float:
+    """Resuelve el set canónico para poblar imports y cachés de SymPy en este worker."""
+    from ..models.schemas import SolveRequest
+    from .solve_service import solve
+
+    start = time.perf_counter()
+    for payload in WARMUP_REQUESTS:
+        try:
+            solve(SolveRequest(**payload))
+        except Exception:
+            logger.warning("Falló la ecuación de precalentamiento %s", payload["equation"], exc_info=True)
+    return time.perf_counter() - start
+
+
+def _process_executor(workers: int) -> ProcessPoolExecutor:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+    else:
+        # Windows: sin fork; cada worker importa por su cuenta
+        ctx = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+
+
+class SolverPool:
+    def __init__(self, workers: int, mode: str = "thread", heavy_workers: int = 0):
+        self.workers = workers
+        self.heavy_workers = heavy_workers
+        self.mode = mode
+        self.state = "cold"  # cold | warming | ready
+        self._executor: Optional[Executor] = None
+        self._heavy: Optional[Executor] = None
+        self._inflight = 0
+        self._heavy_inflight = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = self._make_executor(self.workers, "solver")
+        if self._heavy is None and self.heavy_workers > 0:
+            self._heavy = self._make_executor(self.heavy_workers, "solver-heavy")
+
+    def _make_executor(self, workers: int, prefix: str) -> Executor:
+        if self.mode == "process":
+            return _process_executor(workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix=prefix)
+
+    def shutdown(self):
+        for executor in (self._executor, self._heavy):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._heavy = None
+        self.state = "cold"
+
+    def _update_gauges(self):
+        metrics.registry.set_gauge("solver_pool_busy_workers", min(self._inflight, self.workers))
+        metrics.registry.set_gauge("solver_pool_heavy_inflight", self._heavy_inflight)
+
+    async def run(
+        self,
+        job: str,
+        *args,
+        profile_label: Optional[str] = None,
+        record: bool = True,
+        lane: str = "normal",
+        control=None,
+    ) -> Tuple[Any, Optional[Dict]]:
+        """Ejecuta el trabajo en el pool (o en el carril pesado) y registra sus etapas en la petición actual."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        heavy = lane == "heavy" and self._heavy is not None
+        if heavy:
+            self._heavy_inflight += 1
+        else:
+            self._inflight += 1
+        self._update_gauges()
+        try:
+            result, timings, report = await loop.run_in_executor(
+                self._heavy if heavy else self._executor, execute, job, args, profile_label, control
+            )
+        finally:
+            if heavy:
+                self._heavy_inflight -= 1
+            else:
+                self._inflight -= 1
+            self._update_gauges()
+        if record:
+            metrics.replay_stages(timings)
+        return result, report
+
+    async def warmup(self):
+        """Precalienta los workers en segundo plano (no bloquea /health)."""
+        self.state = "warming"
+        try:
+            if self.mode == "process":
+                # Un trabajo por worker para que todos los procesos se creen ya
+                runs = await asyncio.gather(*(self.run("warmup", record=False) for _ in range(self.workers)))
+                elapsed = max(run[0] for run in runs)
+            else:
+                # Con hilos las cachés de SymPy son compartidas: basta una pasada
+                elapsed, _ = await self.run("warmup", record=False)
+            logger.info("Pool de resolución precalentado en %.2f s", elapsed)
+        except Exception:
+            logger.warning("Falló el precalentamiento del pool", exc_info=True)
+        self.state = "ready"
+
+
+pool = SolverPool(settings.SOLVER_WORKERS, settings.SOLVER_POOL_MODE, settings.SOLVER_HEAVY_WORKERS)